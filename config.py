@@ -1,50 +1,250 @@
 # config.py - File konfigurasi untuk robot Ellee
 import os
+import sys
+import types
+import typing
 
-class Config:
+# Pilihan enum-like, di-intern supaya perbandingan == berhenti di cek identitas pointer
+TTS_GTTS = sys.intern("gtts")
+TTS_ELEVENLABS = sys.intern("elevenlabs")
+VISION_QUALITY_LOW = sys.intern("low")
+VISION_QUALITY_HIGH = sys.intern("high")
+
+# Nilai default (bisa di-override dari environment variables untuk development)
+_DEFAULTS = {
     # OpenAI API Configuration
-    OPENAI_API_KEY = "******************"
-    
+    'OPENAI_API_KEY': None,  # Dari env OPENAI_API_KEY atau OS keyring (lihat _resolve_secret)
+
     # TTS Configuration
-    TTS_ENGINE = "elevenlabs"  # Options: "gtts", "elevenlabs"
-    
+    'TTS_ENGINE': "elevenlabs",  # Options: "gtts", "elevenlabs"
+
     # ElevenLabs API Configuration (optional)
-    ELEVENLABS_API_KEY = "*******************"
-    ELEVENLABS_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"  # Default voice Rachel
-    
+    'ELEVENLABS_API_KEY': None,  # Dari env ELEVENLABS_API_KEY atau OS keyring
+    'ELEVENLABS_VOICE_ID': "21m00Tcm4TlvDq8ikWAM",  # Default voice Rachel
+
     # gTTS Configuration
-    GTTS_LANGUAGE = "en"  # Language code
-    
+    'GTTS_LANGUAGE': "en",  # Language code
+
     # Robot Configuration
-    ROBOT_NAME = "Ellee"
-    
+    'ROBOT_NAME': "Ellee",
+
     # Camera Configuration
-    CAMERA_INDEX = 0  # Berdasarkan hasil test
-    CAMERA_WIDTH = 640
-    CAMERA_HEIGHT = 480
-    
+    'CAMERA_INDEX': 0,  # Berdasarkan hasil test
+    'CAMERA_WIDTH': 640,
+    'CAMERA_HEIGHT': 480,
+
     # Audio Configuration
-    SAMPLE_RATE = 48000  # Based on test results
-    CHUNK_SIZE = 1024    # Based on test results  
-    MICROPHONE_DEVICE_INDEX = 11  # C270 HD WEBCAM USB Audio
-    
+    'SAMPLE_RATE': 48000,  # Based on test results
+    'CHUNK_SIZE': 1024,    # Based on test results
+    'MICROPHONE_DEVICE_INDEX': 11,  # C270 HD WEBCAM USB Audio
+
     # Vision Analysis Configuration
-    VISION_ANALYSIS_ENABLED = True
-    VISION_MAX_TOKENS = 400  # For GPT Vision responses
-    VISION_IMAGE_QUALITY = "high"  # "low" or "high"
-    
+    'VISION_ANALYSIS_ENABLED': True,
+    'VISION_MAX_TOKENS': 400,  # For GPT Vision responses
+    'VISION_IMAGE_QUALITY': "high",  # "low" or "high"
+
     # Electronics Analysis Settings
-    SAVE_ANALYSIS_IMAGES = True  # Save images for memory system
-    ANALYSIS_HISTORY_LIMIT = 50  # Number of analyses to remember
-    
+    'SAVE_ANALYSIS_IMAGES': True,  # Save images for memory system
+    'ANALYSIS_HISTORY_LIMIT': 50,  # Number of analyses to remember
+
     # Conversation Settings
-    MAX_CONVERSATION_HISTORY = 10
-    LISTENING_TIMEOUT = 10  # seconds
-    RESPONSE_TIMEOUT = 30   # seconds
+    'MAX_CONVERSATION_HISTORY': 10,
+    'LISTENING_TIMEOUT': 10,  # seconds
+    'RESPONSE_TIMEOUT': 30,   # seconds
+
+    # System Monitoring
+    'HEALTH_CHECK_INTERVAL': 60,  # seconds, minimal 30
+}
+
+# Konstanta turunan, dihitung sekali saat build supaya loop audio/video tidak mengulang perkalian
+_DERIVED = (
+    ('AUDIO_BYTES_PER_SEC', lambda v: v['SAMPLE_RATE'] * 2),  # 16-bit mono
+    ('VIDEO_FRAME_BYTES', lambda v: v['CAMERA_WIDTH'] * v['CAMERA_HEIGHT'] * 3),  # BGR uint8
+    ('CHUNKS_PER_SEC', lambda v: v['SAMPLE_RATE'] // v['CHUNK_SIZE']),
+)
+
+# Keys yang boleh di-override dari environment: (nama, tipe). Satu env.get per key,
+# cast hanya kalau env var-nya memang di-set. Tambah override = tambah satu baris.
+_ENV_OVERRIDES = (
+    ('OPENAI_API_KEY', str),
+    ('ELEVENLABS_API_KEY', str),
+)
+if __debug__:
+    # Override untuk development saja; blok ini dibuang compiler saat jalan dengan -O/-OO
+    _ENV_OVERRIDES += (
+        ('CAMERA_INDEX', int),
+        ('SAMPLE_RATE', int),
+        ('MICROPHONE_DEVICE_INDEX', int),
+    )
+_ENV_CASTS = dict(_ENV_OVERRIDES)
+
+# POSIX (Jetson): baca lewat os.environb dengan key bytes yang di-encode sekali di sini,
+# jadi lookup tidak meng-encode key dan value hanya di-decode kalau env var-nya di-set.
+_ENVIRONB = os.environb if os.supports_bytes_environ else None
+_ENV_DEFAULT = os.environ if _ENVIRONB is None else _ENVIRONB
+_ENV_BYTES_KEYS = {name: os.fsencode(name) for name, _ in _ENV_OVERRIDES}
 
-# Untuk development, bisa override dari environment variables
-if os.getenv('OPENAI_API_KEY'):
-    Config.OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+def _env_get(env, name):
+    """Ambil env var sebagai str (atau None), pakai key bytes kalau env-nya os.environb"""
+    if env is _ENVIRONB:
+        value = env.get(_ENV_BYTES_KEYS[name])
+        return None if value is None else os.fsdecode(value)
+    return env.get(name)
+
+# Credentials baru di-resolve saat pertama kali diakses (lazy), lalu di-memoize.
+# Run yang hanya pakai gTTS / tanpa OpenAI tidak pernah menyentuh key-nya.
+# Value = username di OS keyring (service _KEYRING_SERVICE).
+_LAZY_FIELDS = {
+    'OPENAI_API_KEY': 'openai',
+    'ELEVENLABS_API_KEY': 'elevenlabs',
+}
+_KEYRING_SERVICE = "ellee"
+
+def _resolve(name, env=_ENV_DEFAULT):
+    """Resolve satu field: env override (kalau diizinkan) atau nilai default"""
+    cast = _ENV_CASTS.get(name)
+    if cast is not None:
+        value = _env_get(env, name)
+        if value:
+            try:
+                return cast(value)
+            except ValueError:
+                raise ValueError("Invalid env override {}={!r}: expected {}".format(name, value, cast.__name__))
+    return _DEFAULTS[name]
+
+def _read_keyring(username):
+    """Ambil secret dari OS keyring; None kalau package keyring tidak ada / gagal"""
+    try:
+        import keyring  # Optional dependency, hanya di-import saat secret pertama kali dipakai
+    except ImportError:
+        return None
     
-if os.getenv('ELEVENLABS_API_KEY'):
-    Config.ELEVENLABS_API_KEY = os.getenv('ELEVENLABS_API_KEY')
\ No newline at end of file
+    try:
+        return keyring.get_password(_KEYRING_SERVICE, username)
+    except Exception as e:
+        print(f"⚠ Keyring lookup for '{username}' failed: {e}")
+        return None
+
+def _resolve_secret(name):
+    """Resolve credential: environment dulu, lalu OS keyring, lalu default (None)"""
+    value = _resolve(name)
+    if value is None:
+        value = _read_keyring(_LAZY_FIELDS[name])
+    return value
+
+# Field tuple: semua nilai eager + turunan, urutan mengikuti _DEFAULTS (tipe dari nilai default).
+# Credentials tidak jadi field tuple karena di-resolve lazy (lihat property di Config).
+_ConfigFields = typing.NamedTuple('_ConfigFields', [
+    (name, type(value)) for name, value in _DEFAULTS.items() if name not in _LAZY_FIELDS
+] + [(name, int) for name, _ in _DERIVED])
+
+# Memo credentials yang sudah di-resolve; dikosongkan tiap kali config di-build ulang
+_SECRET_CACHE = {}
+
+def _cached_secret(name):
+    """Resolve credential sekali, lalu ambil dari memo"""
+    try:
+        return _SECRET_CACHE[name]
+    except KeyError:
+        value = _SECRET_CACHE[name] = _resolve_secret(name)
+        return value
+
+class Config(_ConfigFields):
+    """Read-only robot configuration (NamedTuple, Python 3.6 compatible)"""
+
+    # Tuple biasa: akses field = index tuple, instance immutable dan tanpa __dict__.
+    # Semua nilai (termasuk env override) di-resolve sebelum instance dibuat;
+    # class __dict__ tidak pernah diubah setelah class dibuat.
+    __slots__ = ()
+
+    @property
+    def OPENAI_API_KEY(self):
+        return _cached_secret('OPENAI_API_KEY')
+
+    @property
+    def ELEVENLABS_API_KEY(self):
+        return _cached_secret('ELEVENLABS_API_KEY')
+
+    def as_mapping(self):
+        """Read-only dict view (MappingProxyType) untuk reader gaya cfg['KEY']"""
+        # Credentials lazy sengaja tidak ikut, supaya tidak ter-dump waktu config di-log
+        return types.MappingProxyType(self._asdict())
+
+# Validasi sekali saat startup (fail-fast), supaya modul lain bisa langsung pakai nilainya
+_VALIDATORS = (
+    ('TTS_ENGINE', frozenset((TTS_GTTS, TTS_ELEVENLABS))),
+    ('VISION_IMAGE_QUALITY', frozenset((VISION_QUALITY_LOW, VISION_QUALITY_HIGH))),
+    ('SAMPLE_RATE', range(8000, 192001)),
+    ('CHUNK_SIZE', range(64, 65537)),
+    ('CAMERA_INDEX', range(0, 64)),
+    ('CAMERA_WIDTH', range(1, 8193)),
+    ('CAMERA_HEIGHT', range(1, 8193)),
+    ('VISION_MAX_TOKENS', range(1, 4097)),
+    ('MAX_CONVERSATION_HISTORY', range(1, 1001)),
+    ('HEALTH_CHECK_INTERVAL', range(30, 86401)),
+)
+
+# Field string enum-like yang di-intern saat build (nilai dari env tidak otomatis di-intern)
+_INTERNED_FIELDS = ('TTS_ENGINE', 'GTTS_LANGUAGE', 'VISION_IMAGE_QUALITY')
+
+def _validate(values):
+    """Raise ValueError untuk nilai config yang di luar pilihan/range yang valid"""
+    for name, allowed in _VALIDATORS:
+        value = values[name]
+        if isinstance(value, bool) or value not in allowed:
+            if isinstance(allowed, range):
+                expected = "an int in [{}, {}]".format(allowed.start, allowed.stop - 1)
+            else:
+                expected = "one of {}".format(sorted(allowed))
+            raise ValueError("Invalid config {}={!r}: expected {}".format(name, value, expected))
+
+def _build_config(env=_ENV_DEFAULT):
+    """Resolve all eager values once and build the read-only config"""
+    # Untuk development, bisa override dari environment variables (lihat _resolve)
+    values = {name: _resolve(name, env) for name in _DEFAULTS if name not in _LAZY_FIELDS}
+    _validate(values)
+    for name in _INTERNED_FIELDS:
+        values[name] = sys.intern(values[name])
+    for name, derive in _DERIVED:
+        values[name] = derive(values)
+
+    _SECRET_CACHE.clear()
+    return Config(**values)
+
+# Sengaja tidak di-cache ke disk (marshal/mmap): build di atas hanya ~20 dict lookup
+# yang bytecode-nya sudah di-cache di __pycache__, jadi stat + baca file cache justru
+# lebih lambat -- dan cache file akan menyimpan API key dalam plaintext.
+# Cukup memo in-process yang di-key dengan fingerprint env yang di-watch.
+_CONFIG_CACHE = {}
+
+def _env_fingerprint(env):
+    """Nilai semua env var yang bisa mengubah config, sebagai key yang hashable"""
+    if env is _ENVIRONB:
+        # Raw bytes sudah cukup sebagai key, tidak perlu di-decode
+        return tuple(env.get(key) for key in _ENV_BYTES_KEYS.values())
+    return tuple(env.get(name) for name, _ in _ENV_OVERRIDES)
+
+def _config_for_env(env=_ENV_DEFAULT):
+    """Config untuk env saat ini: reuse kalau env sama, build ulang kalau berubah"""
+    key = _env_fingerprint(env)
+    config = _CONFIG_CACHE.get(key)
+    if config is None:
+        config = _CONFIG_CACHE[key] = _build_config(env)
+    return config
+
+# Worker process yang di-fork (start method default di Linux/Jetson) mewarisi CONFIG yang
+# sudah di-resolve lewat halaman memori copy-on-write -- tidak perlu shared memory terpisah.
+def get_config():
+    """Accessor config -- bind sekali per function: cfg = get_config()"""
+    # Sengaja tanpa lru_cache: memo fingerprint env (_config_for_env) sudah satu dict probe,
+    # dan lru_cache akan membekukan config pertama walaupun env var yang di-watch berubah
+    return _config_for_env()
+
+CONFIG = get_config()
+
+# Nilai eager juga di-export sebagai global modul (CAMERA_WIDTH, SAMPLE_RATE, ...) untuk hot
+# path: "from config import SAMPLE_RATE" di-bind sekali saat import, bukan attribute lookup.
+# Credentials tidak ikut di-export (tetap lazy lewat get_config()).
+# Nilai numerik di sini selalu int biasa (sudah di-cast + divalidasi), jadi aman dipakai
+# sebagai konstanta compile-time oleh kernel JIT (mis. Numba membekukan int global modul).
+globals().update(CONFIG.as_mapping())
@@ -25,58 +25,95 @@ import argparse
 import signal
 import threading
 import logging
-import json
+import logging.handlers
+import queue
+import atexit
+import heapq
+import selectors
+import importlib
+import importlib.util
+import io
 from datetime import datetime, timedelta
-import cv2
-import traceback
-import psutil
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+import itertools
+import functools
+import random
+from collections import deque
 
 # Add project root to path
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
 # Import all enhanced modules with error handling
+# Modul berat (brain, memory, project manager, cv2, psutil, test functions) di-import
+# lazy di tempat pemakaian pertama, supaya --help / --memory-stats / --health-check cepat.
 try:
-    from config import Config
-    # Import movement-enabled brain module
-    from enhanced_brain_module_with_movement import EnhancedElleeBrainWithMovement
-    from memory_system import ElleeBrainMemory
-    from project_manager import AdvancedProjectManager
-    from smart_electronics_analyzer import SmartElectronicsAnalyzer
-    from vision_module import VisionSystem
-    from fixed_speech_module import test_fixed_speech
-    from tts_wrapper import test_tts_wrapper
-    from openai_vision_fallback import test_vision_fallback
-    
-    # Import movement modules
-    from enhanced_motor_control import ElleeMotorController
-    from movement_commands import MovementCommandProcessor
-    
+    from config import get_config
 except ImportError as e:
     print(f"❌ Failed to import required modules: {e}")
     print("💡 Make sure all dependencies are installed and modules are available")
     sys.exit(1)
 
 # Setup logging
+LOG_MAX_BYTES = 10 * 1024 * 1024  # Rotate log file setiap 10 MB
+LOG_BACKUP_COUNT = 5
+
+_log_listener = None
+
+# Brain recovery backoff: min(BASE * 2^attempt + U(0, BASE), MAX) detik
+RECOVERY_BASE_DELAY = 1.0
+RECOVERY_MAX_DELAY = 30.0
+RECOVERY_STABILITY_WINDOW = 60.0  # Brain harus stabil selama ini sebelum counter di-reset
+
+MOVEMENT_STATUS_TTL = 0.25  # seconds, overlay preview tidak perlu status movement per frame
+
+# Separator banner, dibuat sekali (Python 3.6 tidak constant-fold "-" * 50)
+_SEP = "-" * 50
+_DSEP = "=" * 60
+
+# Warna overlay vision preview (BGR)
+OVERLAY_COLOR_INFO = (0, 255, 0)
+OVERLAY_COLOR_MOVING = (255, 0, 0)
+
 def setup_logging(debug_mode=False):
     """Setup comprehensive logging system"""
+    global _log_listener
+    
+    if _log_listener is not None:
+        # Sudah di-setup (main() dan robot sama-sama memanggil ini)
+        return logging.getLogger(__name__)
+    
     log_level = logging.DEBUG if debug_mode else logging.INFO
     
     # Create logs directory
     os.makedirs("logs", exist_ok=True)
     
-    # Setup logging configuration
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(f"logs/ellee_movement_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    # File dan stdout handler jalan di thread QueueListener, jadi logger.* dari
+    # thread monitor hanya enqueue record dan tidak pernah block di disk/TTY I/O
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    log_path = f"logs/ellee_movement_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    handlers = [
+        logging.handlers.RotatingFileHandler(log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT),
+        logging.StreamHandler(sys.stdout)
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.Queue(-1)
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)  # Flush sisa record saat exit
+    
+    logging.basicConfig(level=log_level, handlers=[logging.handlers.QueueHandler(log_queue)])
     
     return logging.getLogger(__name__)
 
+def _update_counters(conversation_length, movement_count, total_interactions, total_movements):
+    """Per-tick counter update for the main loop: totals never go backwards"""
+    # Sengaja tanpa Numba @njit: dipanggil 1x per detik, overhead dispatch/compile JIT lebih
+    # besar dari dua max() ini, dan numba bukan dependency wajib di Jetson
+    return max(total_interactions, conversation_length), max(total_movements, movement_count)
+
 class SystemHealthMonitor:
     """Monitor system health and performance"""
     
@@ -86,30 +123,76 @@ class SystemHealthMonitor:
         self.memory_threshold = 85.0  # %
         self.disk_threshold = 90.0  # %
         
+        # Stats cache supaya status printer / health check tidak sampling ulang tiap dipanggil
+        self.stats_cache_ttl = 2.0  # seconds
+        self._last_stats = None
+        self._last_stats_ts = 0
+        
+        # Hasil check_system_health terakhir; burst call (startup, health task, key 'h') pakai ini
+        self.health_check_ttl = 30.0  # seconds
+        self._last_check_result = None
+        self._last_check_ts = 0
+        
+        # Prime baseline CPU: call berikutnya dengan interval=None langsung return (non-blocking)
+        try:
+            import psutil  # Lazy: hanya di-load kalau health monitor dipakai
+            psutil.cpu_percent(interval=None)
+        except Exception:
+            pass
+        
     def get_system_stats(self):
         """Get current system statistics"""
+        now = time.time()
+        if self._last_stats is not None and now - self._last_stats_ts < self.stats_cache_ttl:
+            return self._last_stats
+        
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            import psutil
+            cpu_percent = psutil.cpu_percent(interval=None)  # Sejak call sebelumnya, tanpa sleep 1s
             memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            disk_percent, disk_free = self._disk_usage('/')
             
-            return {
+            stats = {
                 'cpu_percent': cpu_percent,
                 'memory_percent': memory.percent,
                 'memory_available_gb': memory.available / (1024**3),
-                'disk_percent': disk.percent,
-                'disk_free_gb': disk.free / (1024**3),
-                'uptime_hours': (time.time() - self.start_time) / 3600
+                'disk_percent': disk_percent,
+                'disk_free_gb': disk_free / (1024**3),
+                'uptime_hours': (now - self.start_time) / 3600
             }
         except Exception as e:
             return {'error': str(e)}
+        
+        self._last_stats = stats
+        self._last_stats_ts = now
+        return stats
+    
+    @staticmethod
+    def _disk_usage(path):
+        """(percent used, free bytes) langsung dari os.statvfs, sama dengan psutil.disk_usage"""
+        if not hasattr(os, 'statvfs'):
+            import psutil  # Non-POSIX fallback
+            disk = psutil.disk_usage(path)
+            return disk.percent, disk.free
+        
+        st = os.statvfs(path)
+        free = st.f_bavail * st.f_frsize  # Yang bisa dipakai user biasa
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        total_user = used + free  # Tanpa blok reserved root, seperti psutil
+        percent = used * 100.0 / total_user if total_user else 0.0
+        return round(percent, 1), free
     
     def check_system_health(self):
         """Check if system is healthy"""
+        now = time.time()
+        if self._last_check_result is not None and now - self._last_check_ts < self.health_check_ttl:
+            return self._last_check_result
+        
         stats = self.get_system_stats()
         
         if 'error' in stats:
-            return False, f"System monitoring error: {stats['error']}"
+            # Error tidak di-cache supaya call berikutnya langsung coba lagi
+            return False, [f"System monitoring error: {stats['error']}"]
         
         warnings = []
         
@@ -122,7 +205,9 @@ class SystemHealthMonitor:
         if stats['disk_percent'] > self.disk_threshold:
             warnings.append(f"Low disk space: {stats['disk_percent']:.1f}% used")
         
-        return len(warnings) == 0, warnings
+        self._last_check_result = (len(warnings) == 0, warnings)
+        self._last_check_ts = now
+        return self._last_check_result
 
 class EnhancedElleeRobotWithMovement:
     """Main Enhanced Ellee Robot Application with Movement Capabilities"""
@@ -130,6 +215,7 @@ class EnhancedElleeRobotWithMovement:
     def __init__(self, config):
         self.config = config
         self.is_running = False
+        self._shutdown_event = threading.Event()  # Di-set bersamaan dengan is_running = False
         self.debug_mode = False
         self.test_mode = False
         
@@ -145,21 +231,32 @@ class EnhancedElleeRobotWithMovement:
         self.health_monitor = SystemHealthMonitor()
         
         # Status tracking
-        self.startup_time = None
+        self.startup_time = None  # Wall clock, untuk display
+        self._startup_mono = None  # time.monotonic(), untuk hitung uptime (kebal NTP jump)
         self.total_interactions = 0
         self.total_movements = 0  # Track movement commands
+        self._last_logged_move = None  # (action, speed) terakhir yang di-log
         self.last_interaction_time = None
         self.last_health_check = 0
-        self.health_check_interval = 30  # seconds
+        self.health_check_interval = config.HEALTH_CHECK_INTERVAL  # seconds (min 30, divalidasi di config)
+        
+        # Snapshot brain.get_enhanced_status() dibagi antara main loop dan status printers
+        self._status_cache = None
+        self._status_cache_ts = 0
         
         # Error tracking
         self.error_count = 0
-        self.last_errors = []
         self.max_error_history = 10
+        self.last_errors = deque(maxlen=self.max_error_history)  # Error terlama otomatis terbuang
         
         # Recovery mechanisms
         self.max_recovery_attempts = 3
         self.recovery_attempts = 0
+        self._recovery_success_time = None  # Kapan recovery terakhir berhasil
+        
+        # Memory stats yang diambil sekali saat shutdown (dipakai summary dan print berikutnya)
+        self._final_stats = None
+        self._memory_stats_broken = False  # Circuit breaker, lihat _get_memory_stats
         
         self.logger.info("🤖 Enhanced Ellee Robot with Movement Initializing...")
     
@@ -176,19 +273,19 @@ class EnhancedElleeRobotWithMovement:
         
         for step_name, init_func in initialization_steps:
             try:
-                self.logger.info(f"🚀 Starting {step_name}...")
+                self.logger.info("🚀 Starting %s...", step_name)
                 success = init_func()
                 
                 if not success:
                     self.logger.error(f"❌ {step_name} initialization failed")
                     return False
                     
-                self.logger.info(f"✅ {step_name} initialized successfully")
+                self.logger.info("✅ %s initialized successfully", step_name)
                 
             except Exception as e:
                 self.logger.error(f"💥 {step_name} initialization error: {e}")
                 if self.debug_mode:
-                    self.logger.debug(traceback.format_exc())
+                    self.logger.debug("Traceback:", exc_info=True)
                 return False
         
         # Post-initialization setup
@@ -203,6 +300,7 @@ class EnhancedElleeRobotWithMovement:
     def _init_memory_system(self):
         """Initialize memory system"""
         try:
+            from memory_system import ElleeBrainMemory
             self.memory = ElleeBrainMemory(self.config)
             return True
         except Exception as e:
@@ -215,6 +313,7 @@ class EnhancedElleeRobotWithMovement:
             if not self.memory:
                 raise RuntimeError("Memory system must be initialized first")
             
+            from project_manager import AdvancedProjectManager
             self.project_manager = AdvancedProjectManager(self.config, self.memory)
             return True
         except Exception as e:
@@ -224,6 +323,7 @@ class EnhancedElleeRobotWithMovement:
     def _init_enhanced_brain_with_movement(self):
         """Initialize enhanced brain with movement capabilities"""
         try:
+            from enhanced_brain_module_with_movement import EnhancedElleeBrainWithMovement
             self.brain = EnhancedElleeBrainWithMovement(self.config)
             return True
         except Exception as e:
@@ -235,6 +335,13 @@ class EnhancedElleeRobotWithMovement:
         if self.brain and self.project_manager:
             self.brain.project_manager = self.project_manager
             self.logger.info("🔗 Systems connected successfully")
+        
+        self._register_movement_listener()
+    
+    def _register_movement_listener(self):
+        """Subscribe to motor controller state changes (instead of polling it)"""
+        if self.brain and getattr(self.brain, 'motor_controller', None):
+            self.brain.motor_controller.on_state_change = self._on_movement_state_change
     
     def start(self, test_mode=False, debug_mode=False):
         """Start the Enhanced Ellee Robot with Movement"""
@@ -246,12 +353,12 @@ class EnhancedElleeRobotWithMovement:
         if debug_mode:
             logging.getLogger().setLevel(logging.DEBUG)
         
-        self.logger.info(f"🚀 Starting Enhanced Ellee Robot with Movement (Test: {test_mode}, Debug: {debug_mode})")
+        self.logger.info("🚀 Starting Enhanced Ellee Robot with Movement (Test: %s, Debug: %s)", test_mode, debug_mode)
         
         # Check system health before starting
         healthy, issues = self.health_monitor.check_system_health()
         if not healthy:
-            self.logger.warning(f"⚠️ System health issues detected: {issues}")
+            self.logger.warning("⚠️ System health issues detected: %s", issues)
             if not self._confirm_start_with_issues():
                 return False
         
@@ -265,7 +372,9 @@ class EnhancedElleeRobotWithMovement:
         signal.signal(signal.SIGTERM, self._signal_handler)
         
         self.is_running = True
+        self._shutdown_event.clear()
         self.startup_time = datetime.now()
+        self._startup_mono = time.monotonic()
         
         # Start brain with error recovery
         try:
@@ -286,7 +395,7 @@ class EnhancedElleeRobotWithMovement:
         except Exception as e:
             self.logger.error(f"❌ Runtime error: {e}")
             if self.debug_mode:
-                self.logger.debug(traceback.format_exc())
+                self.logger.debug("Traceback:", exc_info=True)
             return False
     
     def _confirm_start_with_issues(self):
@@ -302,144 +411,126 @@ class EnhancedElleeRobotWithMovement:
     
     def _print_startup_info_with_movement(self):
         """Print enhanced startup information including movement capabilities"""
+        buf = io.StringIO()  # Satu write ke stdout, bukan puluhan print()
         
-        print("\n" + "="*70)
-        print("🤖 ENHANCED ELLEE ROBOT - ELECTRONICS ASSISTANT WITH MOVEMENT v3.0")
-        print("="*70)
-        print(f"🕒 Started: {self.startup_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"🎯 Mode: {'Test Mode (120s)' if self.test_mode else 'Normal Operation'}")
-        print(f"🔧 Debug: {'Enabled' if self.debug_mode else 'Disabled'}")
+        print("\n" + "="*70, file=buf)
+        print("🤖 ENHANCED ELLEE ROBOT - ELECTRONICS ASSISTANT WITH MOVEMENT v3.0", file=buf)
+        print("="*70, file=buf)
+        print(f"🕒 Started: {self.startup_time.strftime('%Y-%m-%d %H:%M:%S')}", file=buf)
+        print(f"🎯 Mode: {'Test Mode (120s)' if self.test_mode else 'Normal Operation'}", file=buf)
+        print(f"🔧 Debug: {'Enabled' if self.debug_mode else 'Disabled'}", file=buf)
         
         # Movement system status
         if self.brain and hasattr(self.brain, 'movement_enabled'):
             movement_status = "✅ ENABLED" if self.brain.movement_enabled else "❌ DISABLED"
-            print(f"🚶 Movement System: {movement_status}")
+            print(f"🚶 Movement System: {movement_status}", file=buf)
         
         # System health info
         stats = self.health_monitor.get_system_stats()
         if 'error' not in stats:
-            print(f"💻 CPU: {stats['cpu_percent']:.1f}% | RAM: {stats['memory_percent']:.1f}% | Disk: {stats['disk_percent']:.1f}%")
+            print(f"💻 CPU: {stats['cpu_percent']:.1f}% | RAM: {stats['memory_percent']:.1f}% | Disk: {stats['disk_percent']:.1f}%", file=buf)
         
         # Memory system info
         if self.memory:
-            try:
-                memory_stats = self.memory.get_memory_stats()
-                print(f"🧠 Memory: {memory_stats['total_conversations']} conversations, {memory_stats['active_projects']} active projects")
-            except Exception as e:
-                print(f"🧠 Memory: Status unavailable ({e})")
+            memory_stats = self._get_memory_stats()
+            if memory_stats:
+                print(f"🧠 Memory: {memory_stats['total_conversations']} conversations, {memory_stats['active_projects']} active projects", file=buf)
+            else:
+                print("🧠 Memory: Status unavailable", file=buf)
         
         # Project manager info
         if self.project_manager:
             try:
                 template_count = len(self.project_manager.project_templates)
-                print(f"📋 Projects: {template_count} templates available")
+                print(f"📋 Projects: {template_count} templates available", file=buf)
             except Exception as e:
-                print(f"📋 Projects: Status unavailable ({e})")
-        
-        print("\n🗣️  ENHANCED VOICE COMMANDS:")
-        print("   📷 Vision Analysis:")
-        print("     • 'Analyze these components' - Computer vision analysis")
-        print("     • 'What do you see?' - Component identification")
-        print("     • 'Check my circuit' - Circuit verification")
-        
-        print("   📋 Project Management:")
-        print("     • 'Save this project as [name]' - Save current setup")
-        print("     • 'What projects do I have?' - List your projects")
-        print("     • 'Continue project [name]' - Resume working on project")
-        print("     • 'Create new project' - Start new project")
-        
-        print("   🚶 MOVEMENT COMMANDS (NEW!):")
-        print("     • 'Move forward' / 'Go forward' - Move robot forward")
-        print("     • 'Move backward' / 'Go back' - Move robot backward")
-        print("     • 'Turn left' / 'Turn right' - Rotate robot")
-        print("     • 'Move left' / 'Move right' - Strafe sideways")
-        print("     • 'Spin around' - Rotate in place")
-        print("     • 'Dance' / 'Show me your moves' - Dance mode")
-        print("     • 'Come here' - Approach user")
-        print("     • 'Stop' / 'Emergency stop' - Stop all movement")
-        
-        print("   🧠 Memory & Learning:")
-        print("     • 'What do you remember?' - Memory statistics")
-        print("     • 'What have we learned?' - Learning progress")
-        
-        print("   📚 Educational Conversations:")
-        print("     • 'Tell me about Arduino' - Electronics education")
-        print("     • 'How does a buzzer work?' - Component explanations")
-        print("     • 'What can I build?' - Project suggestions")
-        
-        print("\n📷 CAMERA FEATURES:")
-        print("   • Automatic component detection and analysis")
-        print("   • Project documentation with photos")
-        print("   • Person detection for conversation management")
-        
-        print("\n⌨️  KEYBOARD COMMANDS (while running):")
-        print("   • 's' - Show detailed status (including movement)")
-        print("   • 'm' - Memory statistics") 
-        print("   • 'p' - Project summary")
-        print("   • 'h' - System health check")
-        print("   • 'v' - Vision preview (10 seconds)")
-        print("   • 'r' - Recovery/restart systems")
-        print("   • 'o' - Movement status and commands")
-        print("   • 'q' - Quit gracefully")
-        
-        print("\n🛡️  SYSTEM FEATURES:")
-        print("   • Automatic error recovery")
-        print("   • System health monitoring")
-        print("   • Conversation memory backup")
-        print("   • Performance optimization")
-        print("   • Movement safety controls")
-        
-        print("="*70)
-        print("✅ Ellee is ready with MOVEMENT! Start talking or show electronics!")
-        print("💡 Say 'Hello Ellee' to begin, or 'Move forward' to test movement!")
-        print("🚶 Try: 'Move forward', 'Turn left', 'Dance', or 'Come here'")
-        print("="*70 + "\n")
+                print(f"📋 Projects: Status unavailable ({e})", file=buf)
+        
+        print("\n🗣️  ENHANCED VOICE COMMANDS:", file=buf)
+        print("   📷 Vision Analysis:", file=buf)
+        print("     • 'Analyze these components' - Computer vision analysis", file=buf)
+        print("     • 'What do you see?' - Component identification", file=buf)
+        print("     • 'Check my circuit' - Circuit verification", file=buf)
+        
+        print("   📋 Project Management:", file=buf)
+        print("     • 'Save this project as [name]' - Save current setup", file=buf)
+        print("     • 'What projects do I have?' - List your projects", file=buf)
+        print("     • 'Continue project [name]' - Resume working on project", file=buf)
+        print("     • 'Create new project' - Start new project", file=buf)
+        
+        print("   🚶 MOVEMENT COMMANDS (NEW!):", file=buf)
+        print("     • 'Move forward' / 'Go forward' - Move robot forward", file=buf)
+        print("     • 'Move backward' / 'Go back' - Move robot backward", file=buf)
+        print("     • 'Turn left' / 'Turn right' - Rotate robot", file=buf)
+        print("     • 'Move left' / 'Move right' - Strafe sideways", file=buf)
+        print("     • 'Spin around' - Rotate in place", file=buf)
+        print("     • 'Dance' / 'Show me your moves' - Dance mode", file=buf)
+        print("     • 'Come here' - Approach user", file=buf)
+        print("     • 'Stop' / 'Emergency stop' - Stop all movement", file=buf)
+        
+        print("   🧠 Memory & Learning:", file=buf)
+        print("     • 'What do you remember?' - Memory statistics", file=buf)
+        print("     • 'What have we learned?' - Learning progress", file=buf)
+        
+        print("   📚 Educational Conversations:", file=buf)
+        print("     • 'Tell me about Arduino' - Electronics education", file=buf)
+        print("     • 'How does a buzzer work?' - Component explanations", file=buf)
+        print("     • 'What can I build?' - Project suggestions", file=buf)
+        
+        print("\n📷 CAMERA FEATURES:", file=buf)
+        print("   • Automatic component detection and analysis", file=buf)
+        print("   • Project documentation with photos", file=buf)
+        print("   • Person detection for conversation management", file=buf)
+        
+        print("\n⌨️  KEYBOARD COMMANDS (while running):", file=buf)
+        print("   • 's' - Show detailed status (including movement)", file=buf)
+        print("   • 'm' - Memory statistics", file=buf)
+        print("   • 'p' - Project summary", file=buf)
+        print("   • 'h' - System health check", file=buf)
+        print("   • 'v' - Vision preview (10 seconds)", file=buf)
+        print("   • 'r' - Recovery/restart systems", file=buf)
+        print("   • 'o' - Movement status and commands", file=buf)
+        print("   • 'q' - Quit gracefully", file=buf)
+        
+        print("\n🛡️  SYSTEM FEATURES:", file=buf)
+        print("   • Automatic error recovery", file=buf)
+        print("   • System health monitoring", file=buf)
+        print("   • Conversation memory backup", file=buf)
+        print("   • Performance optimization", file=buf)
+        print("   • Movement safety controls", file=buf)
+        
+        print("="*70, file=buf)
+        print("✅ Ellee is ready with MOVEMENT! Start talking or show electronics!", file=buf)
+        print("💡 Say 'Hello Ellee' to begin, or 'Move forward' to test movement!", file=buf)
+        print("🚶 Try: 'Move forward', 'Turn left', 'Dance', or 'Come here'", file=buf)
+        print("="*70 + "\n", file=buf)
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
     
     def _run_normal_mode_with_movement(self):
         """Run in normal operational mode with movement monitoring"""
         
         self.logger.info("🤖 Enhanced Ellee with movement is now running in normal mode...")
         
-        # Start monitoring threads
+        # Start monitoring threads: satu scheduler untuk semua task periodik,
+        # keyboard tetap thread sendiri karena blocking di stdin
         threads = [
-            threading.Thread(target=self._status_monitor_with_movement, daemon=True),
-            threading.Thread(target=self._keyboard_monitor_with_movement, daemon=True),
-            threading.Thread(target=self._health_monitor_loop, daemon=True),
-            threading.Thread(target=self._error_recovery_monitor, daemon=True),
-            threading.Thread(target=self._movement_monitor, daemon=True)  # New movement monitor
+            threading.Thread(target=self._monitor_scheduler, daemon=True),
+            threading.Thread(target=self._keyboard_monitor_with_movement, daemon=True)
         ]
         
         for thread in threads:
             thread.start()
         
         try:
-            # Main run loop
-            while self.is_running:
-                time.sleep(1)
-                
-                # Update interaction and movement tracking
-                if self.brain:
-                    try:
-                        status = self.brain.get_enhanced_status()
-                        
-                        # Track interactions
-                        if status['conversation_length'] > 0:
-                            self.total_interactions = status['conversation_length']
-                            self.last_interaction_time = datetime.now()
-                        
-                        # Track movements
-                        if status.get('movement_status', {}).get('total_movements', 0) > 0:
-                            self.total_movements = status['movement_status']['total_movements']
-                            
-                    except Exception as e:
-                        self._handle_error(f"Status update error: {e}")
-                
+            # Main thread tidur sampai shutdown diminta (signal, 'q'); tracking jalan di scheduler
+            self._shutdown_event.wait()
         except KeyboardInterrupt:
             self.logger.info("🛑 Shutdown requested via keyboard interrupt")
         except Exception as e:
             self.logger.error(f"❌ Runtime error in main loop: {e}")
             if self.debug_mode:
-                self.logger.debug(traceback.format_exc())
+                self.logger.debug("Traceback:", exc_info=True)
         
         finally:
             self._shutdown_with_movement()
@@ -456,14 +547,14 @@ class EnhancedElleeRobotWithMovement:
         print("🧠 Memory and learning features active")
         print("🚶 MOVEMENT COMMANDS ACTIVE - Try 'move forward', 'dance', etc!")
         
-        start_time = time.time()
+        start_time = time.monotonic()
         test_duration = 120  # Extended test time
         
         try:
-            while self.is_running and (time.time() - start_time) < test_duration:
+            while self.is_running and (time.monotonic() - start_time) < test_duration:
                 # Show vision preview if available
                 if self.brain and self.brain.vision_system:
-                    remaining_time = test_duration - (time.time() - start_time)
+                    remaining_time = test_duration - (time.monotonic() - start_time)
                     window_title = f"Enhanced Ellee with Movement - {remaining_time:.0f}s remaining"
                     
                     key = self.brain.vision_system.show_preview(window_title)
@@ -480,8 +571,11 @@ class EnhancedElleeRobotWithMovement:
                         self._print_health_status()
                     elif key == ord('o'):
                         self._print_movement_status()
-                
-                time.sleep(0.1)
+                    
+                    # show_preview sudah waitKey(1); tunggu frame berikutnya, bukan sleep tetap
+                    self.brain.vision_system.wait_for_frame(timeout=0.1)
+                else:
+                    time.sleep(0.1)
                 
         except KeyboardInterrupt:
             self.logger.info("🛑 Test mode interrupted")
@@ -494,67 +588,139 @@ class EnhancedElleeRobotWithMovement:
         self.logger.info("✅ Enhanced test mode with movement completed")
         return True
     
-    def _movement_monitor(self):
-        """Monitor movement system continuously"""
-        while self.is_running:
+    def _get_brain_status(self, max_age=1.0):
+        """brain.get_enhanced_status() with a short TTL cache shared by all callers"""
+        now = time.time()
+        if self._status_cache is None or now - self._status_cache_ts >= max_age:
+            self._status_cache = self.brain.get_enhanced_status()
+            self._status_cache_ts = now
+        return self._status_cache
+    
+    def _monitor_scheduler(self):
+        """Run all periodic monitor tasks from one thread using a min-heap of deadlines"""
+        
+        # name -> (callback, period in seconds)
+        tasks = {
+            # Print status every 60 seconds in debug mode, 300 seconds in normal mode
+            'status': (self._status_monitor_with_movement, 60 if self.debug_mode else 300),
+            'health': (self._health_monitor_loop, self.health_check_interval),
+            'recovery': (self._error_recovery_monitor, 30),
+            'interaction': (self._interaction_monitor, 5)
+        }
+        
+        now = time.time()
+        schedule = [(now + period, name) for name, (_, period) in tasks.items()]
+        heapq.heapify(schedule)
+        
+        while not self._shutdown_event.is_set():
+            deadline, name = heapq.heappop(schedule)
+            delay = deadline - time.time()
+            if delay > 0 and self._shutdown_event.wait(delay):
+                break
+            
+            callback, period = tasks[name]
+            next_delay = None
             try:
-                if self.brain and hasattr(self.brain, 'motor_controller') and self.brain.motor_controller:
-                    status = self.brain.motor_controller.get_movement_status()
-                    
-                    # Log movement activity
-                    if status.get('is_moving'):
-                        self.logger.debug(f"Movement active: {status.get('current_action')} at {status.get('current_speed')}%")
-                
-                time.sleep(5)
-                
+                # Task boleh return delay sendiri untuk run berikutnya (mis. recovery backoff)
+                next_delay = callback()
             except Exception as e:
-                self.logger.error(f"Movement monitor error: {e}")
-                time.sleep(10)
+                self.logger.error(f"{name.capitalize()} monitor error: {e}")
+            
+            heapq.heappush(schedule, (time.time() + (next_delay or period), name))
     
-    def _status_monitor_with_movement(self):
-        """Enhanced status monitor including movement info"""
-        
-        last_status_time = time.time()
+    def _interaction_monitor(self):
+        """Update interaction and movement tracking (scheduled every 5s by _monitor_scheduler)"""
+        if not self.brain:
+            return
         
-        while self.is_running:
-            current_time = time.time()
-            
-            # Print status every 60 seconds in debug mode, 300 seconds in normal mode
-            interval = 60 if self.debug_mode else 300
+        try:
+            status = self._get_brain_status()
             
-            if not self.test_mode and (current_time - last_status_time) > interval:
-                if self.debug_mode:
-                    self._print_detailed_status_with_movement()
-                else:
-                    self._print_brief_status_with_movement()
-                last_status_time = current_time
+            conversation_length = status['conversation_length']
+            movement_count = (status.get('movement_status') or {}).get('total_movements', 0)
             
-            time.sleep(5)
+            # Track interactions and movements
+            self.total_interactions, self.total_movements = _update_counters(
+                conversation_length, movement_count,
+                self.total_interactions, self.total_movements)
+            if conversation_length > 0:
+                self.last_interaction_time = datetime.now()
+                
+        except Exception as e:
+            self._handle_error(f"Status update error: {e}")
+    
+    def _request_shutdown(self):
+        """Stop the main loop and wake every thread waiting on the shutdown event"""
+        self.is_running = False
+        self._shutdown_event.set()
+    
+    def _on_movement_state_change(self, status):
+        """Motor controller callback: track and log movement start/stop transitions"""
+        self.total_movements = status.get('total_movements', self.total_movements)
+        
+        # Log movement activity, hanya kalau (action, speed) berubah
+        if status.get('is_moving'):
+            move = (status.get('current_action'), status.get('current_speed'))
+        else:
+            move = None
+        if move == self._last_logged_move:
+            return
+        self._last_logged_move = move
+        
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        if move:
+            self.logger.debug("Movement active: %s at %s%%", move[0], move[1])
+        else:
+            self.logger.debug("Movement stopped")
+    
+    def _status_monitor_with_movement(self):
+        """Print periodic status including movement info (scheduled by _monitor_scheduler)"""
+        if self.test_mode:
+            return
+        
+        if self.debug_mode:
+            # Detailed status periodik hanya di debug mode. Headless (stdout di-pipe ke
+            # supervisor/journal): cukup satu baris log ringkas, tidak render blok status
+            if sys.stdout.isatty():
+                self._print_detailed_status_with_movement()
+            else:
+                self._log_status_line()
+        else:
+            self._print_brief_status_with_movement()
+    
+    def _log_status_line(self):
+        """Satu baris log status ringkas (pengganti detailed status saat headless)"""
+        stats = self.health_monitor.get_system_stats()
+        self.logger.info("status: int=%s mv=%s err=%s cpu=%s", self.total_interactions,
+                         self.total_movements, self.error_count, stats.get('cpu_percent', '?'))
     
     def _keyboard_monitor_with_movement(self):
         """Enhanced keyboard monitor with movement commands"""
         
+        if self.test_mode:
+            return  # Test mode pakai key dari preview window
+        
         try:
-            while self.is_running:
-                if not self.test_mode:
-                    # In normal mode, check for input without blocking
-                    try:
-                        import select
-                        import sys
-                        
-                        if select.select([sys.stdin], [], [], 0.1)[0]:
-                            key = sys.stdin.read(1).lower()
-                            self._handle_keyboard_command_with_movement(key)
-                    except ImportError:
-                        # Fallback for systems without select
-                        time.sleep(1)
-                    except Exception as e:
-                        self.logger.debug(f"Keyboard monitor error: {e}")
-                        time.sleep(1)
-                else:
-                    time.sleep(1)
+            # Block sampai stdin readable (bukan polling 100ms); timeout 1s hanya untuk cek is_running
+            selector = selectors.DefaultSelector()
+            selector.register(sys.stdin, selectors.EVENT_READ)
         except Exception as e:
             self.logger.error(f"Keyboard monitor failed: {e}")
+            return
+        
+        try:
+            while not self._shutdown_event.is_set():
+                try:
+                    for _key, _events in selector.select(timeout=1.0):
+                        key = sys.stdin.read(1).lower()
+                        self._handle_keyboard_command_with_movement(key)
+                except Exception as e:
+                    self.logger.debug("Keyboard monitor error: %s", e)
+                    if self._shutdown_event.wait(1):
+                        break
+        finally:
+            selector.close()
     
     def _handle_keyboard_command_with_movement(self, key):
         """Handle keyboard commands including movement"""
@@ -578,7 +744,7 @@ class EnhancedElleeRobotWithMovement:
                 self._print_movement_status()
             elif key == 'q':
                 self.logger.info("🛑 Shutdown requested via keyboard")
-                self.is_running = False
+                self._request_shutdown()
             else:
                 # Show help for unknown keys
                 self._print_keyboard_help_with_movement()
@@ -587,105 +753,113 @@ class EnhancedElleeRobotWithMovement:
     
     def _print_keyboard_help_with_movement(self):
         """Print keyboard command help including movement"""
-        print("\n⌨️  KEYBOARD COMMANDS:")
-        print("  s - Detailed Status (including movement)")
-        print("  m - Memory Statistics")
-        print("  p - Project Summary")
-        print("  h - System Health")
-        print("  v - Vision Preview")
-        print("  r - Manual Recovery")
-        print("  e - Error History")
-        print("  o - Movement Status")
-        print("  q - Quit")
-        print()
+        buf = io.StringIO()
+        print("\n⌨️  KEYBOARD COMMANDS:", file=buf)
+        print("  s - Detailed Status (including movement)", file=buf)
+        print("  m - Memory Statistics", file=buf)
+        print("  p - Project Summary", file=buf)
+        print("  h - System Health", file=buf)
+        print("  v - Vision Preview", file=buf)
+        print("  r - Manual Recovery", file=buf)
+        print("  e - Error History", file=buf)
+        print("  o - Movement Status", file=buf)
+        print("  q - Quit", file=buf)
+        print(file=buf)
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+    
+    def _uptime(self):
+        """Uptime as a whole-second timedelta, measured with the monotonic clock"""
+        return timedelta(seconds=int(time.monotonic() - self._startup_mono))
     
     def _print_brief_status_with_movement(self):
         """Print brief system status including movement"""
-        if self.startup_time:
-            uptime = datetime.now() - self.startup_time
-            uptime_str = str(uptime).split('.')[0]  # Remove microseconds
-            
-            status_line = f"🤖 Ellee Status: {uptime_str} uptime"
-            
-            if self.brain:
-                try:
-                    brain_status = self.brain.get_enhanced_status()
-                    status_line += f" | State: {brain_status['state'].upper()}"
-                    status_line += f" | Person: {'Yes' if brain_status['person_detected'] else 'No'}"
-                    
-                    # Add movement info
-                    if brain_status.get('movement_enabled'):
-                        movement_status = brain_status.get('movement_status', {})
-                        if movement_status.get('is_moving'):
-                            status_line += f" | Moving: {movement_status.get('current_action', 'unknown')}"
-                        else:
-                            status_line += " | Moving: No"
-                    
-                except:
-                    status_line += " | Brain: Unknown"
-            
-            print(status_line)
+        if not self.startup_time:
+            return
+        
+        uptime_str = self._uptime()
+        brain_info = ""
+        
+        if self.brain:
+            try:
+                brain_status = self._get_brain_status()
+                state = brain_status.get('state', 'unknown').upper()
+                person = 'Yes' if brain_status.get('person_detected') else 'No'
+                brain_info = f" | State: {state} | Person: {person}"
+                
+                # Add movement info
+                if brain_status.get('movement_enabled'):
+                    mv_status = brain_status.get('movement_status') or {}
+                    moving = mv_status.get('current_action', 'unknown') if mv_status.get('is_moving') else 'No'
+                    brain_info = f"{brain_info} | Moving: {moving}"
+                
+            except Exception:
+                brain_info = " | Brain: Unknown"
+        
+        print(f"🤖 Ellee Status: {uptime_str} uptime{brain_info}")
     
     def _print_detailed_status_with_movement(self):
         """Print detailed system status including movement"""
+        buf = io.StringIO()
         
-        print("\n📊 ENHANCED ELLEE DETAILED STATUS WITH MOVEMENT")
-        print("-" * 60)
+        print("\n📊 ENHANCED ELLEE DETAILED STATUS WITH MOVEMENT", file=buf)
+        print("-" * 60, file=buf)
         
         # Uptime and basic info
         if self.startup_time:
-            uptime = datetime.now() - self.startup_time
-            print(f"⏱️  Uptime: {uptime}")
+            print(f"⏱️  Uptime: {self._uptime()}", file=buf)
         
-        print(f"🤝 Total Interactions: {self.total_interactions}")
-        print(f"🚶 Total Movements: {self.total_movements}")
-        print(f"🔧 Debug Mode: {self.debug_mode}")
-        print(f"❌ Error Count: {self.error_count}")
+        print(f"🤝 Total Interactions: {self.total_interactions}", file=buf)
+        print(f"🚶 Total Movements: {self.total_movements}", file=buf)
+        print(f"🔧 Debug Mode: {self.debug_mode}", file=buf)
+        print(f"❌ Error Count: {self.error_count}", file=buf)
         
         if self.last_interaction_time:
             time_since = datetime.now() - self.last_interaction_time
-            print(f"🕒 Last Interaction: {time_since.seconds}s ago")
+            print(f"🕒 Last Interaction: {time_since.seconds}s ago", file=buf)
         
         # Brain status
         if self.brain:
             try:
-                status = self.brain.get_enhanced_status()
-                print(f"🤖 Brain State: {status['state'].upper()}")
-                print(f"👤 Person Detected: {status['person_detected']}")
-                print(f"🗣️  Speaking: {status['is_speaking']}")
-                print(f"💬 Conversation Active: {status.get('conversation_active', 'Unknown')}")
-                print(f"📋 Project Mode: {status['project_mode']}")
-                print(f"🎯 Current Project: {status['current_project'] or 'None'}")
-                print(f"📈 Teaching Success: {status['teaching_success_rate']}")
+                status = self._get_brain_status()
+                print(f"🤖 Brain State: {status['state'].upper()}", file=buf)
+                print(f"👤 Person Detected: {status['person_detected']}", file=buf)
+                print(f"🗣️  Speaking: {status['is_speaking']}", file=buf)
+                print(f"💬 Conversation Active: {status.get('conversation_active', 'Unknown')}", file=buf)
+                print(f"📋 Project Mode: {status['project_mode']}", file=buf)
+                print(f"🎯 Current Project: {status['current_project'] or 'None'}", file=buf)
+                print(f"📈 Teaching Success: {status['teaching_success_rate']}", file=buf)
                 
                 # Movement status
-                print(f"🚶 Movement Enabled: {status['movement_enabled']}")
+                print(f"🚶 Movement Enabled: {status['movement_enabled']}", file=buf)
                 if status['movement_enabled']:
                     mv_status = status.get('movement_status', {})
-                    print(f"🚶 Currently Moving: {mv_status.get('is_moving', False)}")
+                    print(f"🚶 Currently Moving: {mv_status.get('is_moving', False)}", file=buf)
                     if mv_status.get('is_moving'):
-                        print(f"🚶 Current Action: {mv_status.get('current_action', 'unknown')}")
-                        print(f"🚶 Current Speed: {mv_status.get('current_speed', 0)}%")
-                    print(f"🚶 Emergency Stop: {mv_status.get('emergency_stop_active', False)}")
-                    print(f"🚶 Total Movements: {mv_status.get('total_movements', 0)}")
+                        print(f"🚶 Current Action: {mv_status.get('current_action', 'unknown')}", file=buf)
+                        print(f"🚶 Current Speed: {mv_status.get('current_speed', 0)}%", file=buf)
+                    print(f"🚶 Emergency Stop: {mv_status.get('emergency_stop_active', False)}", file=buf)
+                    print(f"🚶 Total Movements: {mv_status.get('total_movements', 0)}", file=buf)
                 
             except Exception as e:
-                print(f"🤖 Brain Status: Error ({e})")
+                print(f"🤖 Brain Status: Error ({e})", file=buf)
         
         # System health
         stats = self.health_monitor.get_system_stats()
         if 'error' not in stats:
-            print(f"💻 CPU: {stats['cpu_percent']:.1f}%")
-            print(f"🧠 Memory: {stats['memory_percent']:.1f}% ({stats['memory_available_gb']:.1f}GB free)")
-            print(f"💾 Disk: {stats['disk_percent']:.1f}% ({stats['disk_free_gb']:.1f}GB free)")
+            print(f"💻 CPU: {stats['cpu_percent']:.1f}%", file=buf)
+            print(f"🧠 Memory: {stats['memory_percent']:.1f}% ({stats['memory_available_gb']:.1f}GB free)", file=buf)
+            print(f"💾 Disk: {stats['disk_percent']:.1f}% ({stats['disk_free_gb']:.1f}GB free)", file=buf)
         
-        print("-" * 60 + "\n")
+        print("-" * 60 + "\n", file=buf)
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
     
     def _print_movement_status(self):
         """Print detailed movement system status"""
         
         print("\n🚶 MOVEMENT SYSTEM STATUS")
-        print("-" * 50)
+        print(_SEP)
         
         if self.brain and hasattr(self.brain, 'movement_enabled'):
             if self.brain.movement_enabled:
@@ -716,11 +890,13 @@ class EnhancedElleeRobotWithMovement:
         else:
             print("❌ Movement system not available")
         
-        print("-" * 50 + "\n")
+        print(_SEP, end="\n\n")
     
     def _shutdown_with_movement(self):
         """Enhanced shutdown including movement system"""
         
+        # Bangunkan semua monitor thread yang sedang menunggu (test mode / error path juga)
+        self._request_shutdown()
         self.logger.info("🔄 Shutting down Enhanced Ellee with Movement...")
         
         shutdown_steps = [
@@ -732,14 +908,17 @@ class EnhancedElleeRobotWithMovement:
         
         for step_name, shutdown_func in shutdown_steps:
             try:
-                self.logger.info(f"🔄 {step_name}...")
+                self.logger.info("🔄 %s...", step_name)
                 shutdown_func()
-                self.logger.info(f"✅ {step_name} completed")
+                self.logger.info("✅ %s completed", step_name)
             except Exception as e:
                 self.logger.error(f"❌ {step_name} failed: {e}")
         
+        # Memory stats diambil sekali di sini lalu dibagi, bukan query ulang per summary
+        self._final_stats = self._get_memory_stats()
+        
         # Print shutdown summary
-        self._print_shutdown_summary_with_movement()
+        self._print_shutdown_summary_with_movement(self._final_stats)
         
         self.logger.info("😴 Enhanced Ellee with movement has shut down successfully")
     
@@ -762,31 +941,30 @@ class EnhancedElleeRobotWithMovement:
         """Backup memory data"""
         if self.memory:
             try:
-                backup_file = f"logs/ellee_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                backup_file = f"logs/ellee_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json.gz"
                 self.memory.export_memories(backup_file)
-                self.logger.info(f"💾 Memory exported to {backup_file}")
+                self.logger.info("💾 Memory exported to %s", backup_file)
             except Exception as e:
                 self.logger.error(f"⚠️ Could not export memory: {e}")
     
     def _cleanup_resources(self):
         """Cleanup system resources"""
         # Close any remaining windows
+        import cv2
         cv2.destroyAllWindows()
         
         # Log final statistics
         if self.startup_time:
-            total_runtime = datetime.now() - self.startup_time
-            self.logger.info(f"⏱️ Total runtime: {total_runtime}")
+            self.logger.info("⏱️ Total runtime: %s", self._uptime())
     
-    def _print_shutdown_summary_with_movement(self):
+    def _print_shutdown_summary_with_movement(self, memory_stats=None):
         """Print shutdown summary including movement stats"""
         
         print("\n📊 SHUTDOWN SUMMARY WITH MOVEMENT")
-        print("-" * 50)
+        print(_SEP)
         
         if self.startup_time:
-            total_runtime = datetime.now() - self.startup_time
-            print(f"⏱️ Total runtime: {total_runtime}")
+            print(f"⏱️ Total runtime: {self._uptime()}")
         
         print(f"🤝 Total interactions: {self.total_interactions}")
         print(f"🚶 Total movements: {self.total_movements}")
@@ -794,73 +972,76 @@ class EnhancedElleeRobotWithMovement:
         print(f"🔄 Recovery attempts: {self.recovery_attempts}")
         
         # Memory stats
-        if self.memory:
-            try:
-                stats = self.memory.get_memory_stats()
-                print(f"💾 Final memory size: {stats['memory_size_mb']} MB")
-                print(f"💬 Conversations saved: {stats['total_conversations']}")
-            except:
-                pass
+        if memory_stats:
+            print(f"💾 Final memory size: {memory_stats['memory_size_mb']} MB")
+            print(f"💬 Conversations saved: {memory_stats['total_conversations']}")
         
-        print("-" * 50)
+        print(_SEP)
     
     def _health_monitor_loop(self):
-        """Continuous system health monitoring"""
-        while self.is_running:
-            try:
-                current_time = time.time()
-                
-                if current_time - self.last_health_check > self.health_check_interval:
-                    healthy, issues = self.health_monitor.check_system_health()
-                    
-                    if not healthy:
-                        self.logger.warning(f"⚠️ System health issues: {', '.join(issues)}")
-                    
-                    self.last_health_check = current_time
-                
-                time.sleep(5)
-                
-            except Exception as e:
-                self.logger.error(f"Health monitor error: {e}")
-                time.sleep(10)
+        """System health check (scheduled every health_check_interval by _monitor_scheduler)"""
+        healthy, issues = self.health_monitor.check_system_health()
+        
+        if not healthy:
+            self.logger.warning("⚠️ System health issues: %s", ', '.join(issues))
+        
+        self.last_health_check = time.time()
     
     def _error_recovery_monitor(self):
-        """Monitor for errors and attempt recovery"""
-        while self.is_running:
-            try:
-                time.sleep(30)  # Check every 30 seconds
-                
-                # Check if brain is responsive
-                if self.brain and hasattr(self.brain, 'is_running'):
-                    if not self.brain.is_running and self.recovery_attempts < self.max_recovery_attempts:
-                        self.logger.warning("🔄 Attempting brain recovery...")
-                        self._attempt_brain_recovery()
-                
-            except Exception as e:
-                self.logger.error(f"Recovery monitor error: {e}")
-                time.sleep(60)
+        """Check brain and attempt recovery (scheduled by _monitor_scheduler, 30s or backoff delay)"""
+        # Check if brain is responsive
+        if self.brain and hasattr(self.brain, 'is_running'):
+            if not self.brain.is_running and self.recovery_attempts < self.max_recovery_attempts:
+                self.logger.warning("🔄 Attempting brain recovery...")
+                self._attempt_brain_recovery()
+            elif (self.brain.is_running and self._recovery_success_time is not None and
+                  time.time() - self._recovery_success_time > RECOVERY_STABILITY_WINDOW):
+                # Brain stabil sejak recovery terakhir -> baru reset backoff budget
+                self.recovery_attempts = 0
+                self._recovery_success_time = None
+        
+        if 0 < self.recovery_attempts < self.max_recovery_attempts:
+            # Masih dalam failure streak: cek lagi setelah backoff, bukan 30s tetap
+            return self._recovery_backoff_delay()
+        # Tidak ada streak, atau budget recovery habis (tidak ada yang dicoba lagi):
+        # periode normal, jangan poll lebih sering dari baseline
+        return None
+    
+    def _recovery_backoff_delay(self):
+        """Exponential backoff with jitter based on the current recovery_attempts"""
+        delay = RECOVERY_BASE_DELAY * (2 ** self.recovery_attempts) + random.uniform(0, RECOVERY_BASE_DELAY)
+        return min(delay, RECOVERY_MAX_DELAY)
     
     def _attempt_brain_recovery(self):
         """Attempt to recover brain system"""
         try:
             self.recovery_attempts += 1
-            self.logger.info(f"🔄 Brain recovery attempt {self.recovery_attempts}/{self.max_recovery_attempts}")
+            self.logger.info("🔄 Brain recovery attempt %d/%d", self.recovery_attempts, self.max_recovery_attempts)
             
             # Stop current brain
             if self.brain:
                 self.brain.stop()
-                time.sleep(2)
+            
+            # Tanpa wait di sini: ini jalan di thread scheduler, jadi backoff antar attempt
+            # datang dari delay yang dikembalikan _error_recovery_monitor
+            if self._shutdown_event.is_set():
+                return
             
             # Reinitialize brain
+            from enhanced_brain_module_with_movement import EnhancedElleeBrainWithMovement
             self.brain = EnhancedElleeBrainWithMovement(self.config)
+            self._status_cache = None  # Snapshot lama milik brain sebelumnya
             if self.project_manager:
                 self.brain.project_manager = self.project_manager
+            self._register_movement_listener()
             
             # Start brain
             self.brain.start()
             
             self.logger.info("✅ Brain recovery successful")
-            self.recovery_attempts = 0  # Reset counter on success
+            # Counter baru di-reset oleh _error_recovery_monitor setelah brain stabil,
+            # supaya brain yang flapping tidak dapat budget recovery penuh tiap siklus
+            self._recovery_success_time = time.time()
             
         except Exception as e:
             self.logger.error(f"❌ Brain recovery failed: {e}")
@@ -871,26 +1052,21 @@ class EnhancedElleeRobotWithMovement:
         """Handle and track errors"""
         self.error_count += 1
         self.last_errors.append({
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': time.time(),  # Epoch float; baru di-format saat ditampilkan
             'message': error_msg
         })
         
-        # Keep only recent errors
-        if len(self.last_errors) > self.max_error_history:
-            self.last_errors.pop(0)
-        
         self.logger.error(error_msg)
     
     def _print_memory_stats(self):
         """Print enhanced memory system statistics"""
         
         print("\n🧠 ENHANCED MEMORY SYSTEM STATISTICS")
-        print("-" * 50)
+        print(_SEP)
         
-        if self.memory:
+        stats = self._get_memory_stats()
+        if stats:
             try:
-                stats = self.memory.get_memory_stats()
-                
                 print(f"💬 Total Conversations: {stats['total_conversations']}")
                 print(f"👥 Known People: {stats['known_people']}")
                 print(f"📋 Active Projects: {stats['active_projects']}")
@@ -905,16 +1081,34 @@ class EnhancedElleeRobotWithMovement:
                 
             except Exception as e:
                 print(f"❌ Memory system error: {e}")
+        elif self.memory:
+            print("❌ Memory statistics unavailable (see log)")
         else:
             print("❌ Memory system not available")
         
-        print("-" * 50 + "\n")
+        print(_SEP, end="\n\n")
+    
+    def _get_memory_stats(self):
+        """memory.get_memory_stats() behind a one-shot circuit breaker; None if unavailable"""
+        # Setelah shutdown pakai snapshot final, tidak query memory system lagi
+        if self._final_stats is not None:
+            return self._final_stats
+        if not self.memory or self._memory_stats_broken:
+            return None
+        
+        try:
+            return self.memory.get_memory_stats()
+        except Exception as e:
+            # Sekali gagal (disk penuh, lock timeout) -> print berikutnya tidak bayar latency yang sama
+            self._memory_stats_broken = True
+            self.logger.warning(f"⚠️ Memory stats unavailable, skipping further reads: {e}")
+            return None
     
     def _print_project_summary(self):
         """Print enhanced project management summary"""
         
         print("\n📋 ENHANCED PROJECT MANAGEMENT SUMMARY")
-        print("-" * 50)
+        print(_SEP)
         
         if self.project_manager:
             try:
@@ -946,13 +1140,13 @@ class EnhancedElleeRobotWithMovement:
         else:
             print("❌ Project manager not available")
         
-        print("-" * 50 + "\n")
+        print(_SEP, end="\n\n")
     
     def _print_health_status(self):
         """Print system health status"""
         
         print("\n🛡️  SYSTEM HEALTH STATUS")
-        print("-" * 50)
+        print(_SEP)
         
         healthy, issues = self.health_monitor.check_system_health()
         
@@ -974,31 +1168,32 @@ class EnhancedElleeRobotWithMovement:
         else:
             print(f"❌ Health monitoring error: {stats['error']}")
         
-        print("-" * 50 + "\n")
+        print(_SEP, end="\n\n")
     
     def _print_error_history(self):
         """Print recent error history"""
         
         print("\n❌ ERROR HISTORY")
-        print("-" * 50)
+        print(_SEP)
         
         if self.last_errors:
             print(f"Total errors: {self.error_count}")
             print(f"Recent errors ({len(self.last_errors)}):")
             
-            for error in self.last_errors[-5:]:  # Show last 5 errors
-                timestamp = datetime.fromisoformat(error['timestamp']).strftime('%H:%M:%S')
+            # Show last 5 errors (deque tidak bisa di-slice, islice tanpa copy)
+            for error in itertools.islice(self.last_errors, max(0, len(self.last_errors) - 5), None):
+                timestamp = time.strftime('%H:%M:%S', time.localtime(error['timestamp']))
                 print(f"   {timestamp}: {error['message']}")
         else:
             print("✅ No recent errors")
         
-        print("-" * 50 + "\n")
+        print(_SEP, end="\n\n")
     
     def _manual_recovery(self):
         """Manual system recovery"""
         
         print("\n🔄 MANUAL SYSTEM RECOVERY")
-        print("-" * 50)
+        print(_SEP)
         
         try:
             print("🔄 Attempting brain recovery...")
@@ -1006,7 +1201,7 @@ class EnhancedElleeRobotWithMovement:
             
             print("🔄 Clearing error history...")
             self.error_count = 0
-            self.last_errors = []
+            self.last_errors.clear()
             self.recovery_attempts = 0
             
             print("✅ Manual recovery completed")
@@ -1014,12 +1209,14 @@ class EnhancedElleeRobotWithMovement:
         except Exception as e:
             print(f"❌ Manual recovery failed: {e}")
         
-        print("-" * 50 + "\n")
+        print(_SEP, end="\n\n")
     
     def _toggle_vision_preview(self):
         """Toggle vision preview window with enhanced features"""
         
         if self.brain and self.brain.vision_system:
+            import cv2
+            import numpy as np
             print("📷 Showing enhanced vision preview for 15 seconds...")
             print("   Press 'q' to exit early")
             print("   Press 's' for status overlay")
@@ -1027,40 +1224,63 @@ class EnhancedElleeRobotWithMovement:
             start_time = time.time()
             duration = 15
             show_overlay = False
+            font = cv2.FONT_HERSHEY_SIMPLEX  # cv2 di-import lazy, jadi di-bind di sini
+            mv_status_ts, mv_status = 0.0, {}
+            # Teks statis (state/movement) di-render sekali ke overlay, hanya ulang kalau berubah
+            overlay_state, overlay, overlay_mask = None, None, None
             
-            while time.time() - start_time < duration:
-                remaining = duration - (time.time() - start_time)
+            # Bind sekali di luar loop (~450 iterasi dalam 15 detik)
+            brain = self.brain
+            vision = brain.vision_system
+            get_frame = vision.get_current_frame
+            motor = getattr(brain, 'motor_controller', None)
+            put_text = cv2.putText
+            wait_key = cv2.waitKey
+            
+            while True:
+                elapsed = time.time() - start_time  # Satu clock read per iterasi
+                if elapsed >= duration:
+                    break
+                remaining = duration - elapsed
                 
                 if show_overlay:
                     # Create status overlay
-                    frame = self.brain.vision_system.get_current_frame()
+                    frame = get_frame()
                     if frame is not None:
-                        # Add text overlay
-                        cv2.putText(frame, f"Time: {remaining:.1f}s", (10, 30), 
-                                  cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-                        cv2.putText(frame, f"State: {self.brain.state.value}", (10, 70), 
-                                  cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+                        # Movement status if available
+                        if motor and elapsed - mv_status_ts > MOVEMENT_STATUS_TTL:
+                            mv_status = motor.get_movement_status()
+                            mv_status_ts = elapsed
+                        moving = mv_status.get('current_action', 'unknown') if mv_status.get('is_moving') else None
                         
-                        # Add movement status if available
-                        if hasattr(self.brain, 'motor_controller') and self.brain.motor_controller:
-                            mv_status = self.brain.motor_controller.get_movement_status()
-                            if mv_status.get('is_moving'):
-                                cv2.putText(frame, f"Moving: {mv_status.get('current_action', 'unknown')}", 
-                                          (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
+                        state = (brain.state.value, moving, frame.shape)
+                        if state != overlay_state:
+                            overlay = np.zeros_like(frame)
+                            put_text(overlay, f"State: {state[0]}", (10, 70), 
+                                     font, 1, OVERLAY_COLOR_INFO, 2)
+                            if moving:
+                                put_text(overlay, f"Moving: {moving}", 
+                                         (10, 110), font, 1, OVERLAY_COLOR_MOVING, 2)
+                            overlay_mask = overlay.any(axis=2, keepdims=True)
+                            overlay_state = state
+                        
+                        # Add text overlay: teks statis dari cache, hanya timer yang digambar per frame
+                        np.copyto(frame, overlay, where=overlay_mask)
+                        put_text(frame, f"Time: {remaining:.1f}s", (10, 30), 
+                                 font, 1, OVERLAY_COLOR_INFO, 2)
                         
                         cv2.imshow("Enhanced Ellee Vision Preview", frame)
                 else:
                     window_title = f"Enhanced Ellee Vision Preview - {remaining:.1f}s"
-                    key = self.brain.vision_system.show_preview(window_title)
+                    key = vision.show_preview(window_title)
                 
-                key = cv2.waitKey(30) & 0xFF
+                # waitKey(30) sudah yield ke GUI dan jadi satu-satunya pacer (~30 fps)
+                key = wait_key(30) & 0xFF
                 
                 if key == ord('q') or key == 27:  # ESC
                     break
                 elif key == ord('s'):
                     show_overlay = not show_overlay
-                
-                time.sleep(0.033)
             
             cv2.destroyAllWindows()
             print("📷 Vision preview closed")
@@ -1069,67 +1289,107 @@ class EnhancedElleeRobotWithMovement:
     
     def _signal_handler(self, signum, frame):
         """Handle system signals for graceful shutdown"""
-        self.logger.info(f"🛑 Received signal {signum}, shutting down gracefully...")
-        self.is_running = False
+        self.logger.info("🛑 Received signal %s, shutting down gracefully...", signum)
+        self._request_shutdown()
+
+SYSTEM_TEST_TIMEOUT = 120  # seconds, untuk semua test paralel sekaligus
+
+@functools.lru_cache(maxsize=1)
+def _probe_mem():
+    """One-shot psutil.virtual_memory() snapshot for the CLI test/check paths"""
+    # Jangan dipakai SystemHealthMonitor: monitor jangka panjang butuh nilai fresh
+    import psutil
+    return psutil.virtual_memory()
+
+# Registry system test: (name, target, resource).
+# target = "module:function" (di-import saat test-nya jalan, jadi modul yang hilang dihitung
+# sebagai FAILED, bukan crash di startup) atau callable yang didaftarkan lewat
+# @register_system_test. Test dengan resource berbeda jalan paralel; yang berbagi device
+# audio tetap berurutan (mic test tidak boleh mendengar suara TTS test).
+_SYSTEM_TESTS = [
+    ("Speech Recognition", "fixed_speech_module:test_fixed_speech", "audio"),
+    ("Text-to-Speech", "tts_wrapper:test_tts_wrapper", "audio"),
+    ("GPT Vision", "openai_vision_fallback:test_vision_fallback", "network"),
+]
+
+def register_system_test(name, resource="default"):
+    """Decorator: add a no-argument test function (returns bool) to --system-test"""
+    def decorator(func):
+        _SYSTEM_TESTS.append((name, func, resource))
+        return func
+    return decorator
+
+def _run_system_test(test_name, target):
+    """Run one system test and return its detailed result"""
+    print(f"\n🔬 Testing {test_name}...")
+    start_time = time.time()
+    
+    try:
+        if isinstance(target, str):
+            module_name, func_name = target.split(':')
+            test_func = getattr(importlib.import_module(module_name), func_name)
+        else:
+            test_func = target
+        result = test_func()
+        duration = time.time() - start_time
+        
+        status = "✅ PASSED" if result else "❌ FAILED"
+        print(f"{status} {test_name} ({duration:.2f}s)")
+        return {'success': result, 'duration': duration, 'error': None}
+        
+    except Exception as e:
+        duration = time.time() - start_time
+        print(f"❌ FAILED {test_name}: {e}")
+        return {'success': False, 'duration': duration, 'error': str(e)}
+
+def _run_system_test_group(group):
+    """Run tests that share a resource one after another: {name: detailed result}"""
+    return {test_name: _run_system_test(test_name, target) for test_name, target, _ in group}
 
 def run_comprehensive_system_tests():
     """Run comprehensive system tests with enhanced diagnostics"""
     
     logger = logging.getLogger(__name__)
     logger.info("🧪 Running Enhanced Ellee Comprehensive System Tests with Movement...")
-    print("=" * 60)
-    
-    tests = [
-        ("Speech Recognition", test_fixed_speech),
-        ("Text-to-Speech", test_tts_wrapper), 
-        ("GPT Vision", test_vision_fallback),
-    ]
+    print(_DSEP)
     
     results = {}
     detailed_results = {}
     
-    for test_name, test_func in tests:
-        print(f"\n🔬 Testing {test_name}...")
-        start_time = time.time()
-        
-        try:
-            result = test_func()
-            end_time = time.time()
-            duration = end_time - start_time
-            
-            results[test_name] = result
-            detailed_results[test_name] = {
-                'success': result,
-                'duration': duration,
-                'error': None
-            }
-            
-            status = "✅ PASSED" if result else "❌ FAILED"
-            print(f"{status} {test_name} ({duration:.2f}s)")
-            
-        except Exception as e:
-            end_time = time.time()
-            duration = end_time - start_time
-            
-            results[test_name] = False
-            detailed_results[test_name] = {
-                'success': False,
-                'duration': duration,
-                'error': str(e)
-            }
-            
-            print(f"❌ FAILED {test_name}: {e}")
+    groups = {}
+    for test in _SYSTEM_TESTS:
+        groups.setdefault(test[2], []).append(test)
+    
+    executor = ThreadPoolExecutor(max_workers=len(groups))
+    futures = [executor.submit(_run_system_test_group, group) for group in groups.values()]
+    try:
+        for future in as_completed(futures, timeout=SYSTEM_TEST_TIMEOUT):
+            detailed_results.update(future.result())
+    except FuturesTimeoutError:
+        print(f"⏰ System tests did not finish within {SYSTEM_TEST_TIMEOUT}s")
+    finally:
+        executor.shutdown(wait=False)
+    
+    # Urutan hasil tetap mengikuti registry, bukan urutan selesai
+    for test_name, _, _ in _SYSTEM_TESTS:
+        details = detailed_results.setdefault(test_name, {
+            'success': False,
+            'duration': SYSTEM_TEST_TIMEOUT,
+            'error': "Timed out"
+        })
+        results[test_name] = details['success']
     
     # Additional system checks
     print(f"\n🔍 Additional System Checks...")
     
-    # Check dependencies
-    try:
-        import cv2, numpy, pygame, speech_recognition
+    # Check dependencies (find_spec: cek terinstall tanpa menjalankan init modulnya)
+    required = ('cv2', 'numpy', 'pygame', 'speech_recognition')
+    missing = [name for name in required if importlib.util.find_spec(name) is None]
+    if not missing:
         print("✅ Core dependencies available")
         results['Dependencies'] = True
-    except ImportError as e:
-        print(f"❌ Missing dependencies: {e}")
+    else:
+        print(f"❌ Missing dependencies: {', '.join(missing)}")
         results['Dependencies'] = False
     
     # Check movement system
@@ -1144,22 +1404,21 @@ def run_comprehensive_system_tests():
     
     # Check system resources
     try:
-        import psutil
-        stats = psutil.virtual_memory()
+        stats = _probe_mem()
         if stats.available > 1024**3:  # At least 1GB available
             print("✅ Sufficient memory available")
             results['Memory'] = True
         else:
             print("⚠️ Low memory warning")
             results['Memory'] = False
-    except:
+    except Exception:
         print("⚠️ Could not check system memory")
         results['Memory'] = False
     
     # Print comprehensive results
-    print("\n" + "=" * 60)
+    print("\n" + _DSEP)
     print("🧪 COMPREHENSIVE SYSTEM TEST RESULTS")
-    print("=" * 60)
+    print(_DSEP)
     
     passed = sum(1 for result in results.values() if result)
     total = len(results)
@@ -1189,6 +1448,28 @@ def run_comprehensive_system_tests():
         print("❌ Multiple system failures detected")
         return False
 
+def run_movement_tests():
+    """Run the quick movement tests, in-process when test_movement_system exposes run_quick()"""
+    try:
+        movement_tests = importlib.import_module("test_movement_system")
+    except ImportError as e:
+        print(f"❌ Movement test module not available: {e}")
+        return False
+    
+    # In-process: pakai ulang modul yang sudah ter-load, tanpa cold start interpreter baru
+    run_quick = getattr(movement_tests, 'run_quick', None)
+    if run_quick is not None:
+        return bool(run_quick())
+    
+    # Fallback untuk versi script lama yang hanya punya blok __main__
+    import subprocess
+    result = subprocess.run([sys.executable, movement_tests.__file__, "--quick"], 
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    print(result.stdout)
+    if result.stderr:
+        print("Errors:", result.stderr)
+    return result.returncode == 0
+
 def main():
     """Enhanced main entry point with movement capabilities"""
     
@@ -1233,14 +1514,7 @@ Voice Commands Available:
             return run_comprehensive_system_tests()
         
         if args.movement_test:
-            # Run movement tests
-            import subprocess
-            result = subprocess.run([sys.executable, "test_movement_system.py", "--quick"], 
-                                  capture_output=True, text=True)
-            print(result.stdout)
-            if result.stderr:
-                print("Errors:", result.stderr)
-            return result.returncode == 0
+            return run_movement_tests()
         
         if args.health_check:
             monitor = SystemHealthMonitor()
@@ -1267,7 +1541,8 @@ Voice Commands Available:
         
         if args.memory_stats:
             try:
-                memory = ElleeBrainMemory(Config)
+                from memory_system import ElleeBrainMemory
+                memory = ElleeBrainMemory(get_config())
                 stats = memory.get_memory_stats()
                 
                 print("🧠 ENHANCED ELLEE MEMORY STATISTICS")
@@ -1283,7 +1558,7 @@ Voice Commands Available:
         # Run main application with movement
         logger.info("🚀 Starting Enhanced Ellee Robot with Movement v3.0")
         
-        robot = EnhancedElleeRobotWithMovement(Config)
+        robot = EnhancedElleeRobotWithMovement(get_config())
         return robot.start(test_mode=args.test_mode, debug_mode=args.debug)
         
     except KeyboardInterrupt:
@@ -1292,7 +1567,7 @@ Voice Commands Available:
     except Exception as e:
         logger.error(f"❌ Enhanced Ellee with movement failed to start: {e}")
         if args.debug:
-            logger.debug(traceback.format_exc())
+            logger.debug("Traceback:", exc_info=True)
         return False
 
 if __name__ == "__main__":
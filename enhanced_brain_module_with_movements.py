@@ -5,9 +5,14 @@ Integrates movement commands dengan existing conversation dan project management
 Fixed all missing methods dan improved AI responsiveness
 """
 
+import re
+import random
+import logging
 import threading
 import time
 import queue
+from collections import deque
+from operator import itemgetter
 from enum import Enum
 import cv2
 import numpy as np
@@ -25,6 +30,225 @@ from memory_system import ElleeBrainMemory
 from enhanced_motor_control import ElleeMotorController
 from movement_commands import MovementCommandProcessor
 
+class _RateLimitFilter(logging.Filter):
+    """Drop record yang isinya sama dengan record sebelumnya dalam `window` detik"""
+    
+    def __init__(self, window=10.0):
+        super().__init__()
+        self.window = window
+        self._last_seen = {}
+    
+    def filter(self, record):
+        key = (record.levelno, record.getMessage())
+        last = self._last_seen.get(key)
+        if last is not None and record.created - last < self.window:
+            return False
+        
+        if len(self._last_seen) > 64:
+            # Buang entry yang sudah lewat window supaya dict tidak tumbuh terus
+            self._last_seen = {k: t for k, t in self._last_seen.items() if record.created - t < self.window}
+        self._last_seen[key] = record.created
+        return True
+
+# Filter di logger (bukan handler): record duplikat dibuang sebelum traceback-nya diformat
+logger = logging.getLogger(__name__)
+logger.addFilter(_RateLimitFilter())
+
+def _keyword_pattern(groups):
+    """Compile ((nama, [keyword, ...]), ...) jadi satu regex dengan named group per nama"""
+    return re.compile("|".join(
+        "(?P<{}>{})".format(name, "|".join(map(re.escape, keywords)))
+        for name, keywords in groups
+    ), re.IGNORECASE)
+
+# Keyword command di-compile sekali saat import: satu scan regex (C) per utterance,
+# bukan puluhan substring check di Python. Match = substring, case-insensitive.
+_ELECTRONICS_COMMAND_RE = _keyword_pattern((
+    ("photo_analysis", ["take a photo", "analyze this", "analyze components", "scan this"]),
+    ("project_suggestions", ["project suggestion", "what can I build", "project ideas"]),
+    ("component_identification", ["what do you see", "identify components", "what components"]),
+    ("circuit_check", ["check my circuit", "verify circuit", "is this correct"]),
+    ("troubleshooting", ["troubleshoot", "what's wrong", "not working", "debug"]),
+    ("quick_check", ["quick look", "quick check", "brief analysis"]),
+))
+
+_MEMORY_COMMAND_RE = _keyword_pattern((
+    ("save_project", ["remember this project", "save this project"]),
+    ("list_projects", ["what projects", "my projects"]),
+    ("continue_project", ["continue project", "resume project"]),
+    ("memory_stats", ["memory stats", "what do you remember"]),
+))
+
+_PROJECT_COMMAND_RE = _keyword_pattern((
+    ("list_projects", ["what projects", "my projects", "list projects"]),
+    ("continue_project", ["continue project", "resume project"]),
+    ("create_project", ["new project", "start project", "create project"]),
+    ("project_status", ["project status", "project progress"]),
+))
+
+# Kalimat pilihan _choice, dibuat sekali saat import (tuple, bukan list baru per panggilan)
+# _choice = bound method Random instance milik modul ini (bukan lookup random.choice tiap kali)
+_choice = random.Random().choice
+# Prompt setelah user diam (lihat _check_conversation_timeout)
+_HELP_MESSAGES = (
+    "Is there anything else you'd like to know about electronics?",
+    "Feel free to ask me more questions or show me your components!",
+    "Would you like to work on a project or learn about specific components?",
+    "I'm here to help with any electronics questions you have!",
+    "Want to try some movement commands? Just say 'move forward' or 'dance'!",
+    "Tell me about any electronics topic - Arduino, ESP32, sensors, anything!",
+)
+
+# Penutup jawaban AI kalau belum ada pertanyaan balik
+_ENCOURAGEMENTS = (
+    " What else would you like to explore?",
+    " Any other questions about this topic?",
+    " Want to dive deeper into this?",
+    " What's your next electronics adventure?",
+    " Anything else I can help you build or learn?",
+)
+
+# Ucapan saat orang pergi
+_GOODBYE_MESSAGES = (
+    "Thanks for the great conversation! Feel free to come back anytime for more electronics help!",
+    "See you later! I'll be here whenever you need electronics assistance!",
+    "Goodbye! Come back soon - I love talking about electronics and helping with projects!",
+    "Take care! I'm always ready to help with your next electronics adventure!",
+)
+
+# Sapaan untuk orang yang belum dikenal memory
+_STRANGER_GREETINGS = (
+    "Hello! I'm Ellee, your passionate electronics assistant robot. I absolutely love helping with Arduino projects, teaching about circuits, and building amazing things together! What brings you here today?",
+    "Hi there! I'm thrilled to meet you! I'm incredibly knowledgeable about electronics and genuinely excited to help with any projects or questions you have. What would you like to explore?",
+    "Welcome! I specialize in electronics education and I'm genuinely enthusiastic about helping people learn and build. From basic LEDs to complex ESP32 projects - I'm here for it all! What interests you?",
+)
+
+# Sapaan untuk orang yang dikenal memory, dipilih dari flags conversation context ({} = nama)
+_KNOWN_GREETING_ELECTRONICS = "Hello {}! Ready to dive into more electronics? I remember our fantastic discussions about circuits and components. I'm excited to explore more with you today! What's on your electronics mind?"
+_KNOWN_GREETING_PROJECT = "Hi {}! How's your project progressing? I've been thinking about our previous conversations. I'm here and ready to help you build something amazing! What's the next step?"
+_KNOWN_GREETING_DEFAULT = "Great to see you again, {}! I'm energized and ready for another exciting electronics conversation. What fascinating topic should we explore today?"
+
+# Potongan jawaban project command, disambung dengan "".join (bukan += per bagian)
+_PROJECTS_LIST_PREFIX = "Here are your exciting projects: "
+_PROJECTS_LIST_ACTIVE = "You have {} active projects: {}. "
+_PROJECTS_LIST_COMPLETED = "You've completed {} projects - that's awesome! "
+_PROJECTS_LIST_SUFFIX = "I'm thrilled to help you continue any of these, start something new, or answer any questions you have!"
+_PROJECT_STATUS = "Your current project '{}' is in {} status. "
+_PROJECT_STATUS_NEXT_STEPS = "Next steps: {}. I'm excited to help you with whatever comes next! What would you like to work on?"
+_PROJECT_STATUS_NO_STEPS = "What would you like to work on next? I'm here to help guide you!"
+
+# Ambil nama dari project dict (C-level, untuk map() di listing project)
+_project_name = itemgetter('name')
+
+# Jawaban "memory stats", disambung dengan "".join
+_STATS_CONVERSATIONS = "Here's what I remember about our journey: I've had {} conversations with you, "
+_STATS_PROJECTS = "you have {} active projects and {} completed ones. "
+_STATS_SIZE = "I'm storing about {} megabytes of memories about our interactions. "
+_STATS_SUFFIX = "I absolutely love learning about your electronics journey! What specific topic would you like to explore today?"
+
+# Sapaan startup berdasarkan jumlah percakapan di memory (lihat _generate_personalized_greeting)
+_STARTUP_GREETING_FIRST = "Hello! I'm Ellee, your brilliant electronics assistant robot. I'm incredibly excited to help you learn about electronics, build amazing projects, and explore the world of Arduino, ESP32, sensors, and circuits!"
+_STARTUP_GREETING_FEW = "Hi there! Great to see you again! We've had {} fascinating conversations about electronics. I'm always thrilled to help with more projects and answer your questions! What exciting topic shall we explore today?"
+_STARTUP_GREETING_PROJECTS = "Welcome back, my electronics friend! I see we have {} active projects. I remember all our previous conversations and I'm energized to continue our electronics journey! What shall we work on today?"
+_STARTUP_GREETING_MANY = "Hello again! We've shared {} amazing conversations about electronics. You've been learning so much, and I love being part of your electronics journey! What new adventure shall we start today?"
+_STARTUP_GREETING_FALLBACK = "Hello! I'm Ellee, your enthusiastic electronics assistant robot. I'm absolutely passionate about helping you with electronics projects and questions! Let's explore something amazing together!"
+
+# Parsing project dari speech + hasil analisa (lihat _extract_project_from_analysis).
+# Urutan _PROJECT_COMPONENTS = urutan komponen di project data.
+_PROJECT_NAME_RE = re.compile(r'\b(?:call|name)\s+it\s+(\S+(?:\s+\S+){0,2})', re.IGNORECASE)  # Maks 3 kata
+_PROJECT_COMPONENTS = ('arduino', 'led', 'resistor', 'breadboard', 'sensor', 'wire', 'capacitor', 'button')
+_PROJECT_COMPONENT_RE = re.compile(r'\b({})s?\b'.format('|'.join(_PROJECT_COMPONENTS)), re.IGNORECASE)
+_PROJECT_ADVANCED_RE = re.compile(r'\b(?:complex|advanced|programming)', re.IGNORECASE)
+
+# Sinyal belajar dari isi percakapan (lihat _learn_from_conversation)
+_POSITIVE_FEEDBACK_RE = re.compile(r"\b(?:great|perfect|excellent|awesome|thanks)", re.IGNORECASE)
+_CONFUSION_RE = re.compile(r"\b(?:confused|don'?t understand|what|huh)", re.IGNORECASE)
+
+# System prompt untuk _generate_enhanced_ai_response: bagian tetap dibuat sekali saat
+# import, per request hanya ditambah suffix memory context / electronics hint
+_AI_SYSTEM_BASE = """You are Ellee, a brilliant and enthusiastic electronics assistant robot. You are:
+- Extremely knowledgeable about electronics, Arduino, ESP32, sensors, circuits, programming
+- Friendly, conversational, and encouraging
+- Quick to respond with helpful, practical information
+- Able to explain complex topics in simple terms
+- Enthusiastic about helping people learn and build projects
+- Capable of movement and always ready to help
+
+IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always sound excited about electronics!"""
+_AI_MEMORY_CONTEXT = "\n\nContext from previous conversations: {}"
+_AI_ELECTRONICS_HINT = "\n\nThe user is asking about electronics. Provide detailed, educational, and practical information. Be specific about how things work and give real examples."
+_AI_ELECTRONICS_TOPIC_RE = _keyword_pattern((
+    ("electronics", ['esp32', 'arduino', 'sensor', 'resistor', 'led', 'circuit', 'programming', 'microcontroller']),
+))
+
+# Jawaban AI yang sudah mengajak lanjut ngobrol (tidak perlu ditambah _ENCOURAGEMENTS)
+_FOLLOW_UP_RE = re.compile(r"\?|would you|do you|what|how|tell me", re.IGNORECASE)
+
+# Topik untuk fallback response kalau AI tidak menjawab (lihat _provide_enhanced_fallback_response)
+_FALLBACK_TOPIC_RE = _keyword_pattern((
+    ("esp32", ["esp32"]),
+    ("arduino", ["arduino"]),
+    ("sensor", ["sensor", "temperature", "ultrasonic", "pressure"]),
+    ("led", ["led", "light", "rgb"]),
+    ("circuit", ["circuit", "breadboard", "wiring"]),
+    ("programming", ["programming", "code", "sketch"]),
+    ("project", ["project", "build", "make"]),
+))
+
+# Fallback response per topik (key = named group di _FALLBACK_TOPIC_RE); suffix
+# penyemangat sudah disambung saat import
+_FALLBACK_SUFFIX = " I'm always excited to dive deep into electronics topics!"
+_FALLBACK_BY_TOPIC = {
+    'esp32': "The ESP32 is an amazing microcontroller! It's incredibly powerful with built-in WiFi and Bluetooth, perfect for IoT projects. It's more powerful than Arduino Uno and great for web servers, sensor networks, and wireless communication. You can program it with Arduino IDE too! What specific ESP32 project are you thinking about?" + _FALLBACK_SUFFIX,
+    'arduino': "Arduino is fantastic for learning electronics! It's beginner-friendly but powerful enough for complex projects. The Arduino Uno is perfect to start with - you can control LEDs, sensors, motors, and build amazing projects. I love helping people with Arduino! What would you like to build?" + _FALLBACK_SUFFIX,
+    'sensor': "Sensors are so exciting! They're like giving your projects the ability to sense the world - temperature, distance, light, pressure, motion, and so much more. Each sensor opens up new project possibilities. What kind of sensor project interests you? I can help you get started!" + _FALLBACK_SUFFIX,
+    'led': "LEDs are perfect for starting electronics! They're simple but you can create amazing effects - blinking patterns, RGB color mixing, LED strips, matrices. Always remember to use a current-limiting resistor to protect them. Want to learn about LED projects or how to calculate the right resistor?" + _FALLBACK_SUFFIX,
+    'circuit': "Circuit building is the heart of electronics! Breadboards are perfect for prototyping - no soldering needed. Start with simple circuits and work your way up. Good connections, proper power distribution, and understanding current flow are key. Need help with a specific circuit?" + _FALLBACK_SUFFIX,
+    'programming': "Programming microcontrollers is incredibly rewarding! Start with simple sketches - blink an LED, read a sensor, control a servo. The Arduino language is based on C++ but much simpler. Practice with small projects and gradually add complexity. What programming challenge are you working on?" + _FALLBACK_SUFFIX,
+    'project': "I love helping with electronics projects! Start with something that excites you - maybe a smart home device, robot, weather station, or game controller. Break big projects into smaller steps. What kind of project sparks your imagination? I'm here to guide you through it!" + _FALLBACK_SUFFIX,
+}
+# General electronics enthusiasm
+_GENERIC_FALLBACK = "That's a great topic! I'm passionate about electronics and love sharing knowledge. Whether it's basic components, complex circuits, programming, or project ideas - I'm here to help you learn and build amazing things. What specific aspect interests you most?" + _FALLBACK_SUFFIX
+
+# Keyword di conversation context yang dicek greeting / error response (lihat _conversation_context):
+# flag -> bentuk kata yang dihitung (context memory menulis "Current projects: ...")
+_CONTEXT_FLAGS = {
+    'electronics': frozenset(('electronics', 'electronic')),
+    'project': frozenset(('project', 'projects')),
+}
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Batas buffer percakapan yang sedang berjalan. Messages yang penuh di-spill ke memory
+# (lihat _append_message); movement_commands cukup dibatasi karena tiap command juga
+# tercatat sebagai message.
+CONVERSATION_MAX_MESSAGES = 200
+CONVERSATION_MAX_MOVEMENTS = 50
+
+# Batas kalimat di stream AI: . ! ? diikuti spasi
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+def _iter_sentences(deltas):
+    """Gabungkan potongan teks stream jadi kalimat utuh, yield tiap kalimat begitu lengkap"""
+    buffer = ""
+    for delta in deltas:
+        buffer += delta
+        parts = _SENTENCE_END_RE.split(buffer)
+        buffer = parts.pop()
+        for sentence in parts:
+            if sentence.strip():
+                yield sentence.strip()
+    if buffer.strip():
+        yield buffer.strip()
+
+def _with_iso_timestamps(entries):
+    """Copy entries untuk disimpan ke memory: 'timestamp' float (time.time()) jadi ISO string"""
+    # Per message hanya simpan float; format string cukup sekali saat conversation disimpan
+    return [
+        dict(entry, timestamp=datetime.fromtimestamp(entry['timestamp']).isoformat())
+        if 'timestamp' in entry else entry
+        for entry in entries
+    ]
+
 class RobotState(Enum):
     IDLE = "idle"
     LISTENING = "listening"  
@@ -34,6 +258,19 @@ class RobotState(Enum):
     LEARNING = "learning"
     MOVING = "moving"  # New state untuk movement
 
+class ConversationState(object):
+    """Tracking percakapan yang sedang berjalan (__slots__: field tetap, akses atribut tanpa dict)"""
+    __slots__ = ('start_time', 'started_at', 'messages', 'topics', 'electronics_analyses', 'movement_commands', 'person_id')
+    
+    def __init__(self, start_time=None, person_id=None):
+        self.start_time = start_time  # time.monotonic() saat mulai, hanya untuk hitung durasi
+        self.started_at = datetime.now().isoformat()  # wall clock, menghubungkan segmen dengan percakapannya
+        self.messages = deque(maxlen=CONVERSATION_MAX_MESSAGES)
+        self.topics = []
+        self.electronics_analyses = []
+        self.movement_commands = deque(maxlen=CONVERSATION_MAX_MOVEMENTS)  # Track movement commands
+        self.person_id = person_id
+
 class EnhancedElleeBrainWithMovement:
     def __init__(self, config):
         self.config = config
@@ -75,13 +312,7 @@ class EnhancedElleeBrainWithMovement:
         self.person_timeout = 10
         
         # Current conversation tracking
-        self.current_conversation = {
-            'start_time': None,
-            'messages': [],
-            'topics': [],
-            'electronics_analyses': [],
-            'movement_commands': []  # Track movement commands
-        }
+        self.current_conversation = ConversationState()
         
         # Project tracking
         self.current_project_id = None
@@ -102,11 +333,53 @@ class EnhancedElleeBrainWithMovement:
         self.movement_during_conversation = True
         self.movement_timeout = 30
         
-        # Thread safety
-        self.state_lock = threading.Lock()
+        # Main loop event-driven: tunggu speech queue / wake event, bukan sleep polling.
+        # loop_interval hanya batas atas tunggu (untuk cek person detection & timeout).
+        self.loop_interval = 0.1
+        self._wake = threading.Event()
+        self._tts_busy = threading.Event()  # Di-set selama TTS synthesis + playback
+        
+        # Antrean untuk TTS worker; _tts_pending = jumlah teks yang belum selesai diucapkan
+        self._tts_queue = queue.Queue()
+        self._tts_pending = 0
+        self._tts_pending_lock = threading.Lock()
+        self._tts_thread = None
+        
+        # Dispatch state machine: RobotState -> handler(current_time)
+        self._state_handlers = {
+            RobotState.IDLE: self._handle_idle_state,
+            RobotState.ENGAGING: self._handle_engaging_state,
+            RobotState.LISTENING: self._handle_listening_state,
+            RobotState.THINKING: self._handle_thinking_state,
+            RobotState.MOVING: self._handle_movement_state,
+            RobotState.LEARNING: self._handle_learning_state,
+            RobotState.SPEAKING: self._handle_speaking_state,
+        }
         
         # AI Response enhancement
         self.ai_response_timeout = 10  # 10 seconds max untuk AI response
+        # Satu worker thread persistent untuk request OpenAI. Inbox maxsize=1 = backpressure:
+        # paling banyak satu request antre di belakang yang sedang jalan, sisanya di-drop
+        self._ai_inbox = queue.Queue(maxsize=1)
+        self._ai_thread = None
+        
+        # Penyimpanan percakapan ke memory (SQLite + file JSON) dikerjakan memory worker,
+        # bukan di jalur respons. Bounded: kalau disk lambat, producer menunggu sebentar lalu
+        # job di-drop (lihat _queue_memory_write), jalur respons tidak pernah ter-block lama
+        self._memory_queue = queue.Queue(maxsize=8)
+        self._memory_thread = None
+        # Messages ditulis main thread (user / movement) dan AI worker (jawaban assistant):
+        # lock untuk append, spill, snapshot, dan ganti current_conversation
+        self._conversation_lock = threading.Lock()
+        
+        # Memo hasil query memory per orang (conversation context, teaching approach),
+        # valid selama memory.mutation_version belum berubah (lihat _memory_memo)
+        self._memo = {}
+        self._memo_version = None
+        
+        # Snapshot get_enhanced_status() terakhir + key input-nya (lihat _status_inputs)
+        self._status_cache = None
+        self._status_key = None
         self.last_ai_response_time = 0
         self.ai_fallback_responses = [
             "That's an interesting question! Let me think about that and get back to you with more details.",
@@ -126,6 +399,21 @@ class EnhancedElleeBrainWithMovement:
             # Start vision system
             self.vision_system.start_capture()
             
+            # Start TTS worker (satu thread untuk semua ucapan, diputar berurutan)
+            self._tts_thread = threading.Thread(target=self._tts_worker, name="tts")
+            self._tts_thread.daemon = True
+            self._tts_thread.start()
+            
+            # Start AI worker (request OpenAI diproses satu per satu dari _ai_inbox)
+            self._ai_thread = threading.Thread(target=self._ai_worker, name="ai")
+            self._ai_thread.daemon = True
+            self._ai_thread.start()
+            
+            # Start memory worker (conversation yang selesai disimpan di background)
+            self._memory_thread = threading.Thread(target=self._memory_worker, name="memory")
+            self._memory_thread.daemon = True
+            self._memory_thread.start()
+            
             # Start main brain loop
             self.main_thread = threading.Thread(target=self._enhanced_main_loop_with_movement)
             self.main_thread.daemon = True
@@ -143,8 +431,6 @@ class EnhancedElleeBrainWithMovement:
     def _generate_personalized_greeting_with_movement(self):
         """Generate greeting yang mentions movement capabilities"""
         try:
-            stats = self.memory.get_memory_stats()
-            
             base_greeting = self._generate_personalized_greeting()
             
             if self.movement_enabled:
@@ -170,70 +456,78 @@ class EnhancedElleeBrainWithMovement:
                 
                 current_time = time.time()
                 
-                # Enhanced state machine dengan MOVING state
-                if self.state == RobotState.IDLE:
-                    if self.person_detected:
-                        if not self.conversation_active:
-                            if current_time - self.last_greeting_time > self.conversation_cooldown:
-                                self._transition_to_engaging()
-                                self.last_greeting_time = current_time
-                                self._start_new_conversation()
-                            else:
-                                self._transition_to_listening()
-                                if not hasattr(self, 'conversation_started') or not self.conversation_started:
-                                    self._start_new_conversation()
-                        else:
-                            self._transition_to_listening()
+                # Enhanced state machine dengan MOVING state: satu dict lookup per tick
+                waited = self._state_handlers[self.state](current_time)
                 
-                elif self.state == RobotState.ENGAGING:
-                    if self.person_detected:
-                        self._greet_person_with_memory()
-                        self._transition_to_listening()
-                        self.conversation_active = True
-                    else:
-                        self._transition_to_idle()
-                
-                elif self.state == RobotState.LISTENING:
-                    if not self.person_detected:
-                        self._handle_person_left()
-                    else:
-                        # Check for speech input
-                        speech = self.speech_listener.get_speech()
-                        if speech:
-                            self.last_speech_time = current_time
-                            self._process_speech_with_movement(speech)
-                        else:
-                            self._check_conversation_timeout(current_time)
-                
-                elif self.state == RobotState.THINKING:
-                    time.sleep(1)
-                    if current_time - getattr(self, 'thinking_start_time', current_time) > 5:
-                        if self.person_detected:
-                            self._transition_to_listening()
-                        else:
-                            self._transition_to_idle()
-                
-                elif self.state == RobotState.MOVING:
-                    self._handle_movement_state()
-                
-                elif self.state == RobotState.LEARNING:
-                    self._handle_learning_state()
-                
-                elif self.state == RobotState.SPEAKING:
-                    if not self.tts_engine.is_speaking():
-                        if self.person_detected:
-                            self._transition_to_listening()
-                        else:
-                            self._handle_person_left()
-                
-                time.sleep(0.1)
+                if not waited:
+                    self._wait_for_wake(self.loop_interval)
                 
             except Exception as e:
-                print("⚠ Error in enhanced main loop with movement: {}".format(e))
-                import traceback
-                print(traceback.format_exc())
+                # Error persisten (mis. kamera lepas) berulang tiap detik: cukup di-log sekali per 10s
+                logger.error("⚠ Error in enhanced main loop with movement: %s", e, exc_info=True)
                 time.sleep(1)
     
+    # State handlers untuk main loop (lihat _state_handlers). Return True kalau handler
+    # sudah block menunggu sendiri, supaya loop tidak menambah tunggu lagi.
+    def _handle_idle_state(self, current_time):
+        if self.person_detected:
+            if not self.conversation_active:
+                if current_time - self.last_greeting_time > self.conversation_cooldown:
+                    self._transition_to_engaging()
+                    self.last_greeting_time = current_time
+                    self._start_new_conversation()
+                else:
+                    self._transition_to_listening()
+                    if not hasattr(self, 'conversation_started') or not self.conversation_started:
+                        self._start_new_conversation()
+            else:
+                self._transition_to_listening()
+    
+    def _handle_engaging_state(self, current_time):
+        if self.person_detected:
+            self._greet_person_with_memory()
+            self._transition_to_listening()
+            self.conversation_active = True
+        else:
+            self._transition_to_idle()
+    
+    def _handle_listening_state(self, current_time):
+        if not self.person_detected:
+            self._handle_person_left()
+            return False
+        
+        # Block di speech queue: speech langsung diproses begitu datang
+        speech = self.speech_listener.get_speech(timeout=self.loop_interval)
+        if speech:
+            self.last_speech_time = current_time
+            self._process_speech_with_movement(speech)
+        else:
+            self._check_conversation_timeout(current_time)
+        return True
+    
+    def _handle_thinking_state(self, current_time):
+        # Thread AI men-set _wake lewat transisi state, jadi tidak perlu tunggu penuh 1s
+        self._wait_for_wake(1)
+        if current_time - getattr(self, 'thinking_start_time', current_time) > 5:
+            if self.person_detected:
+                self._transition_to_listening()
+            else:
+                self._transition_to_idle()
+        return True
+    
+    def _handle_speaking_state(self, current_time):
+        # _tts_busy menutup jeda synthesis antar kalimat, saat mixer belum memutar apa-apa
+        if not self._tts_busy.is_set() and not self.tts_engine.is_speaking():
+            if self.person_detected:
+                self._transition_to_listening()
+            else:
+                self._handle_person_left()
+    
+    def _wait_for_wake(self, timeout):
+        """Tunggu sampai ada perubahan state/TTS selesai (_wake di-set) atau timeout"""
+        if self._wake.wait(timeout):
+            self._wake.clear()
+    
     def _check_conversation_timeout(self, current_time):
         """Check if we should prompt for more conversation - FIXED MISSING METHOD"""
         if self.conversation_active and self.last_speech_time > 0:
@@ -243,20 +537,10 @@ class EnhancedElleeBrainWithMovement:
             if time_since_speech > self.speech_timeout:
                 self.last_speech_time = current_time  # Reset to avoid repeated prompts
                 
-                help_messages = [
-                    "Is there anything else you'd like to know about electronics?",
-                    "Feel free to ask me more questions or show me your components!",
-                    "Would you like to work on a project or learn about specific components?",
-                    "I'm here to help with any electronics questions you have!",
-                    "Want to try some movement commands? Just say 'move forward' or 'dance'!",
-                    "Tell me about any electronics topic - Arduino, ESP32, sensors, anything!"
-                ]
-                
-                import random
-                help_message = random.choice(help_messages)
+                help_message = _choice(_HELP_MESSAGES)
                 self._speak(help_message)
     
-    def _handle_movement_state(self):
+    def _handle_movement_state(self, current_time):
         """Handle movement state transitions"""
         if self.movement_enabled and self.motor_controller:
             status = self.motor_controller.get_movement_status()
@@ -303,94 +587,112 @@ class EnhancedElleeBrainWithMovement:
         """Enhanced regular conversation processing dengan better AI responsiveness"""
         print("💬 Processing enhanced conversation: '{}'".format(speech_text))
         
-        with self.state_lock:
-            self._transition_to_thinking()
-            self.thinking_start_time = time.time()
-        
-        # Add user message to conversation
-        self.conversation_manager.add_message("user", speech_text)
-        
-        # Add to current conversation tracking
-        self.current_conversation['messages'].append({
-            'role': 'user',
-            'content': speech_text,
-            'timestamp': datetime.now().isoformat(),
-            'type': 'regular_conversation'
-        })
+        # Timestamp di-set sebelum state berubah, jadi THINKING handler tidak pernah
+        # melihat timestamp lama; cukup urutan assignment, tanpa lock
+        self.thinking_start_time = time.time()
+        self._transition_to_thinking()
         
         # Get memory context
-        memory_context = self.memory.get_conversation_context(self.current_person_id, limit=3)
+        memory_context, _ = self._conversation_context(self.current_person_id, limit=3)
         
-        # Generate AI response dengan timeout dan fallback
-        threading.Thread(target=self._generate_enhanced_ai_response, args=(memory_context, speech_text), daemon=True).start()
+        # Generate AI response dengan timeout dan fallback. User message baru dicatat oleh
+        # AI worker saat request-nya diproses, jadi utterance yang di-drop tidak masuk history
+        try:
+            self._ai_inbox.put_nowait((memory_context, speech_text, time.time()))
+        except queue.Full:
+            # Request yang sedang jalan akan memindahkan state setelah selesai
+            print("🤔 Still thinking about the previous question, dropping: '{}'".format(speech_text))
+    
+    def _ai_worker(self):
+        """Worker thread AI: proses request dari _ai_inbox satu per satu"""
+        while True:
+            job = self._ai_inbox.get()
+            if job is None:  # Sentinel dari stop()
+                break
+            
+            memory_context, speech_text, spoken_at = job
+            # Catat user message tepat sebelum jawabannya dibuat: history selalu berpasangan
+            # pertanyaan -> jawaban, dan prompt sudah berisi pertanyaan ini
+            self.conversation_manager.add_message("user", speech_text)
+            self._append_message({
+                'role': 'user',
+                'content': speech_text,
+                'timestamp': spoken_at,
+                'type': 'regular_conversation'
+            })
+            self._generate_enhanced_ai_response(memory_context, speech_text)
+    
+    def _cancel_pending_ai(self):
+        """Buang request AI yang masih antre (yang sudah jalan dibiarkan selesai)"""
+        try:
+            while True:
+                self._ai_inbox.get_nowait()
+        except queue.Empty:
+            pass
     
     def _generate_enhanced_ai_response(self, memory_context, original_speech):
         """Generate AI response dengan enhanced fallback dan faster response"""
+        # Token speaking untuk seluruh jawaban: antrean TTS bisa kosong sementara stream
+        # masih menunggu network, dan mic tidak boleh nyala di tengah jawaban
+        self._hold_speaking()
         try:
-            start_time = time.time()
-            
-            # Get conversation for AI dengan memory context
-            messages = self.conversation_manager.get_conversation_for_ai()
-            
-            # Enhanced system message untuk lebih personal dan responsive
-            enhanced_system = """You are Ellee, a brilliant and enthusiastic electronics assistant robot. You are:
-- Extremely knowledgeable about electronics, Arduino, ESP32, sensors, circuits, programming
-- Friendly, conversational, and encouraging
-- Quick to respond with helpful, practical information
-- Able to explain complex topics in simple terms
-- Enthusiastic about helping people learn and build projects
-- Capable of movement and always ready to help
-
-IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always sound excited about electronics!"""
+            start_time = time.monotonic()
             
+            # Enhanced system message untuk lebih personal dan responsive:
+            # base tetap + suffix opsional, disusun dalam satu f-string. Urutan dari yang paling
+            # stabil ke yang paling sering berubah (base, hint topik, memory context), supaya
+            # prefix prompt sama antar request dan bisa kena prompt caching di sisi API
             if memory_context and memory_context != "This is a new conversation.":
-                enhanced_system += f"\n\nContext from previous conversations: {memory_context}"
+                memory_part = _AI_MEMORY_CONTEXT.format(memory_context)
+            else:
+                memory_part = ""
             
             # Special handling untuk electronics topics
-            electronics_topics = ['esp32', 'arduino', 'sensor', 'resistor', 'led', 'circuit', 'programming', 'microcontroller']
-            if any(topic in original_speech.lower() for topic in electronics_topics):
-                enhanced_system += "\n\nThe user is asking about electronics. Provide detailed, educational, and practical information. Be specific about how things work and give real examples."
+            electronics_part = _AI_ELECTRONICS_HINT if _AI_ELECTRONICS_TOPIC_RE.search(original_speech) else ""
             
-            messages[0]['content'] = enhanced_system
+            # Get conversation for AI dengan memory context: system prompt langsung di-pass;
+            # history di manager dibatasi deque(maxlen), jadi biaya per turn tetap
+            messages = self.conversation_manager.get_conversation_for_ai(
+                system_prompt=f"{_AI_SYSTEM_BASE}{electronics_part}{memory_part}"
+            )
             
-            # Try AI response dengan timeout
-            response = None
+            # Stream AI response: tiap kalimat langsung di-TTS sementara sisanya masih
+            # datang, jadi latency yang terasa = kalimat pertama, bukan AI + TTS penuh
+            spoken = []
             try:
-                response = self.openai_client.chat_completion(
+                deltas = self.openai_client.chat_completion_stream(
                     messages=messages,
                     max_tokens=250,  # Increased untuk detailed responses
                     temperature=0.8  # Slightly higher untuk more personality
                 )
+                for sentence in _iter_sentences(deltas):
+                    if not spoken:
+                        print(f"🧠 First AI sentence in {time.monotonic() - start_time:.2f}s")
+                    spoken.append(sentence)
+                    # Masuk antrean TTS worker; stream lanjut dibaca selagi kalimat ini diputar
+                    self._speak(sentence)
             except Exception as e:
                 print(f"⚠ AI API error: {e}")
-                response = None
             
-            response_time = time.time() - start_time
+            response_time = time.monotonic() - start_time
             
-            if response and len(response.strip()) > 10:
-                print(f"🧠 AI Response generated in {response_time:.2f}s: {response}")
+            if spoken:
+                response = " ".join(spoken)
+                print(f"🧠 AI Response streamed in {response_time:.2f}s: {response}")
                 
                 # Add conversation-encouraging ending jika belum ada
-                if not any(end in response.lower() for end in ['?', 'would you', 'do you', 'what', 'how', 'tell me']):
-                    encouragements = [
-                        " What else would you like to explore?",
-                        " Any other questions about this topic?",
-                        " Want to dive deeper into this?",
-                        " What's your next electronics adventure?",
-                        " Anything else I can help you build or learn?"
-                    ]
-                    import random
-                    response += random.choice(encouragements)
+                if not _FOLLOW_UP_RE.search(response):
+                    ending = _choice(_ENCOURAGEMENTS)
+                    self._speak(ending.strip())
+                    response += ending
                 
                 # Add to conversation managers
                 self.conversation_manager.add_message("assistant", response)
-                self.current_conversation['messages'].append({
+                self._append_message({
                     'role': 'assistant',
                     'content': response,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': time.time()
                 })
-                
-                self._speak(response)
             else:
                 # Enhanced fallback responses berdasarkan topic
                 self._provide_enhanced_fallback_response(original_speech)
@@ -400,55 +702,30 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
             self._provide_enhanced_fallback_response(original_speech)
         
         finally:
-            # Always return to listening to continue conversation
-            self._transition_to_listening()
+            # Lepas token jawaban; kalau semua kalimat sudah diucapkan, _finish_speaking
+            # langsung pindah ke LISTENING, kalau belum, setelah kalimat terakhir
+            self._release_speaking()
     
     def _provide_enhanced_fallback_response(self, original_speech):
         """Provide enhanced fallback response berdasarkan topic"""
         
-        speech_lower = original_speech.lower()
-        
-        # Topic-specific fallback responses
-        if 'esp32' in speech_lower:
-            fallback = "The ESP32 is an amazing microcontroller! It's incredibly powerful with built-in WiFi and Bluetooth, perfect for IoT projects. It's more powerful than Arduino Uno and great for web servers, sensor networks, and wireless communication. You can program it with Arduino IDE too! What specific ESP32 project are you thinking about?"
+        match = _FALLBACK_TOPIC_RE.search(original_speech)
+        topic = match.lastgroup if match else None
         
-        elif 'arduino' in speech_lower:
-            fallback = "Arduino is fantastic for learning electronics! It's beginner-friendly but powerful enough for complex projects. The Arduino Uno is perfect to start with - you can control LEDs, sensors, motors, and build amazing projects. I love helping people with Arduino! What would you like to build?"
-        
-        elif any(word in speech_lower for word in ['sensor', 'temperature', 'ultrasonic', 'pressure']):
-            fallback = "Sensors are so exciting! They're like giving your projects the ability to sense the world - temperature, distance, light, pressure, motion, and so much more. Each sensor opens up new project possibilities. What kind of sensor project interests you? I can help you get started!"
-        
-        elif any(word in speech_lower for word in ['led', 'light', 'rgb']):
-            fallback = "LEDs are perfect for starting electronics! They're simple but you can create amazing effects - blinking patterns, RGB color mixing, LED strips, matrices. Always remember to use a current-limiting resistor to protect them. Want to learn about LED projects or how to calculate the right resistor?"
-        
-        elif any(word in speech_lower for word in ['circuit', 'breadboard', 'wiring']):
-            fallback = "Circuit building is the heart of electronics! Breadboards are perfect for prototyping - no soldering needed. Start with simple circuits and work your way up. Good connections, proper power distribution, and understanding current flow are key. Need help with a specific circuit?"
-        
-        elif any(word in speech_lower for word in ['programming', 'code', 'sketch']):
-            fallback = "Programming microcontrollers is incredibly rewarding! Start with simple sketches - blink an LED, read a sensor, control a servo. The Arduino language is based on C++ but much simpler. Practice with small projects and gradually add complexity. What programming challenge are you working on?"
-        
-        elif any(word in speech_lower for word in ['project', 'build', 'make']):
-            fallback = "I love helping with electronics projects! Start with something that excites you - maybe a smart home device, robot, weather station, or game controller. Break big projects into smaller steps. What kind of project sparks your imagination? I'm here to guide you through it!"
-        
-        else:
-            # General electronics enthusiasm
-            fallback = "That's a great topic! I'm passionate about electronics and love sharing knowledge. Whether it's basic components, complex circuits, programming, or project ideas - I'm here to help you learn and build amazing things. What specific aspect interests you most?"
-        
-        # Add conversation encouragement
-        fallback += " I'm always excited to dive deep into electronics topics!"
+        # Satu dict lookup dari hasil scan topik, bukan rantai if/elif
+        fallback = _FALLBACK_BY_TOPIC.get(topic, _GENERIC_FALLBACK)
         
         self._speak(fallback)
     
     def _process_movement_command(self, speech_text):
         """Process movement commands"""
-        with self.state_lock:
-            self._transition_to_moving()
+        self._transition_to_moving()
         
         # Add to current conversation
-        self.current_conversation['messages'].append({
+        self._append_message({
             'role': 'user',
             'content': speech_text,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': time.time(),
             'type': 'movement_command'
         })
         
@@ -457,11 +734,11 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
         
         if result['success']:
             # Record movement command
-            self.current_conversation['movement_commands'].append({
+            self.current_conversation.movement_commands.append({
                 'command': speech_text,
                 'command_type': result.get('command_type'),
                 'success': True,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': time.time()
             })
             
             # Speak response
@@ -487,80 +764,80 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
             
             # Double check they're really gone
             if not self.person_detected:
+                self._cancel_pending_ai()
                 self._end_current_conversation()
                 self.conversation_active = False
-                goodbye_messages = [
-                    "Thanks for the great conversation! Feel free to come back anytime for more electronics help!",
-                    "See you later! I'll be here whenever you need electronics assistance!",
-                    "Goodbye! Come back soon - I love talking about electronics and helping with projects!",
-                    "Take care! I'm always ready to help with your next electronics adventure!"
-                ]
-                import random
-                self._speak(random.choice(goodbye_messages))
+                self._speak(_choice(_GOODBYE_MESSAGES))
                 self._transition_to_idle()
     
     def _handle_memory_commands(self, speech_text):
         """Handle memory-related commands"""
-        text_lower = speech_text.lower()
+        match = _MEMORY_COMMAND_RE.search(speech_text)
+        if match is None:
+            return False
         
-        if 'remember this project' in text_lower or 'save this project' in text_lower:
+        command = match.lastgroup
+        if command == 'save_project':
             self._handle_save_project_command(speech_text)
-            return True
-        
-        elif 'what projects' in text_lower or 'my projects' in text_lower:
+        elif command == 'list_projects':
             self._handle_list_projects_command()
-            return True
-        
-        elif 'continue project' in text_lower or 'resume project' in text_lower:
+        elif command == 'continue_project':
             self._handle_continue_project_command(speech_text)
-            return True
-        
-        elif 'memory stats' in text_lower or 'what do you remember' in text_lower:
+        else:  # memory_stats
             self._handle_memory_stats_command()
-            return True
-        
-        return False
+        return True
     
     def _handle_project_commands(self, speech_text):
         """Handle project management commands"""
-        text_lower = speech_text.lower()
+        match = _PROJECT_COMMAND_RE.search(speech_text)
+        if match is None:
+            return False
         
-        if 'what projects' in text_lower or 'my projects' in text_lower or 'list projects' in text_lower:
+        command = match.lastgroup
+        if command == 'list_projects':
             self._handle_list_projects_command()
-            return True
-        
-        elif 'continue project' in text_lower or 'resume project' in text_lower:
+        elif command == 'continue_project':
             self._handle_continue_project_command(speech_text)
-            return True
-        
-        elif 'new project' in text_lower or 'start project' in text_lower or 'create project' in text_lower:
+        elif command == 'create_project':
             self._handle_create_project_command(speech_text)
-            return True
-        
-        elif 'project status' in text_lower or 'project progress' in text_lower:
+        else:  # project_status
             self._handle_project_status_command()
-            return True
-        
-        return False
+        return True
     
     def _is_electronics_command(self, text):
         """Check if speech contains electronics-related commands"""
-        text_lower = text.lower()
-        
-        commands = {
-            "photo_analysis": ["take a photo", "analyze this", "analyze components", "scan this"],
-            "project_suggestions": ["project suggestion", "what can I build", "project ideas"],
-            "component_identification": ["what do you see", "identify components", "what components"],
-            "circuit_check": ["check my circuit", "verify circuit", "is this correct"],
-            "troubleshooting": ["troubleshoot", "what's wrong", "not working", "debug"],
-            "quick_check": ["quick look", "quick check", "brief analysis"]
-        }
-        
-        for command_type, keywords in commands.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return command_type
-        
-        return None
+        match = _ELECTRONICS_COMMAND_RE.search(text)
+        return match.lastgroup if match else None
+    
+    def _memory_memo(self):
+        """Dict memo untuk hasil query memory; dikosongkan setiap kali memory berubah"""
+        version = self.memory.mutation_version
+        if version != self._memo_version:
+            self._memo.clear()
+            self._memo_version = version
+        return self._memo
+    
+    def _conversation_context(self, person_id, limit):
+        """get_conversation_context() yang di-memo sampai memory berubah; return (context, flags)"""
+        memo = self._memory_memo()
+        key = ('context', person_id, limit)
+        entry = memo.get(key)
+        if entry is None:
+            context = self.memory.get_conversation_context(person_id, limit=limit)
+            # Tokenize sekali per entry; tiap flag = cek irisan set kata, bukan scan substring
+            words = frozenset(_WORD_RE.findall(context.lower()))
+            flags = {name: not forms.isdisjoint(words) for name, forms in _CONTEXT_FLAGS.items()}
+            entry = memo[key] = (context, flags)
+        return entry
+    
+    def _teaching_approach(self, person_id, topic):
+        """get_personalized_teaching_approach() yang di-memo sampai memory berubah (dict jangan diubah)"""
+        memo = self._memory_memo()
+        key = ('teaching', person_id, topic)
+        approach = memo.get(key)
+        if approach is None:
+            approach = memo[key] = self.memory.get_personalized_teaching_approach(person_id, topic)
+        return approach
     
     # Implement all missing methods that were referenced
     def _load_startup_context(self):
@@ -568,13 +845,10 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
         try:
             stats = self.memory.get_memory_stats()
             
-            active_projects = [p for p in self.memory.project_cache.values() 
-                             if p['status'] in ['planning', 'in_progress']]
-            
-            if active_projects:
-                print("📋 Found {} active projects in memory".format(len(active_projects)))
+            if stats['active_projects']:
+                print("📋 Found {} active projects in memory".format(stats['active_projects']))
                 
-            recent_context = self.memory.get_conversation_context(limit=3)
+            recent_context, _ = self._conversation_context(None, limit=3)
             if recent_context and recent_context != "This is a new conversation.":
                 print("🧠 Loaded context: {}".format(recent_context))
                 
@@ -586,34 +860,59 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
         try:
             stats = self.memory.get_memory_stats()
             
-            if stats['total_conversations'] == 0:
-                return "Hello! I'm Ellee, your brilliant electronics assistant robot. I'm incredibly excited to help you learn about electronics, build amazing projects, and explore the world of Arduino, ESP32, sensors, and circuits!"
+            total_conversations = stats['total_conversations']
+            
+            if total_conversations == 0:
+                return _STARTUP_GREETING_FIRST
             
-            elif stats['total_conversations'] < 5:
-                return "Hi there! Great to see you again! We've had {} fascinating conversations about electronics. I'm always thrilled to help with more projects and answer your questions! What exciting topic shall we explore today?".format(stats['total_conversations'])
+            elif total_conversations < 5:
+                return _STARTUP_GREETING_FEW.format(total_conversations)
             
             else:
-                active_projects = len([p for p in self.memory.project_cache.values() 
-                                     if p['status'] in ['planning', 'in_progress']])
+                active_projects = stats['active_projects']
                 
                 if active_projects > 0:
-                    return "Welcome back, my electronics friend! I see we have {} active projects. I remember all our previous conversations and I'm energized to continue our electronics journey! What shall we work on today?".format(active_projects)
+                    return _STARTUP_GREETING_PROJECTS.format(active_projects)
                 else:
-                    return "Hello again! We've shared {} amazing conversations about electronics. You've been learning so much, and I love being part of your electronics journey! What new adventure shall we start today?".format(stats['total_conversations'])
+                    return _STARTUP_GREETING_MANY.format(total_conversations)
                     
         except Exception as e:
-            return "Hello! I'm Ellee, your enthusiastic electronics assistant robot. I'm absolutely passionate about helping you with electronics projects and questions! Let's explore something amazing together!"
+            return _STARTUP_GREETING_FALLBACK
+    
+    def _append_message(self, message):
+        """Tambah message ke percakapan; kalau buffer penuh, spill isinya ke memory dulu"""
+        spilled = None
+        with self._conversation_lock:
+            conversation = self.current_conversation
+            messages = conversation.messages
+            if len(messages) == messages.maxlen:
+                # deque membuang yang lama tanpa kabar, jadi simpan sebagai segmen percakapan
+                spilled = list(messages)
+                messages.clear()
+            messages.append(message)
+        
+        # Format + antre di luar lock; ditandai segmen supaya memory tidak menghitungnya
+        # sebagai percakapan baru yang sudah selesai
+        if spilled is not None:
+            segment_data = {
+                'messages': _with_iso_timestamps(spilled),
+                'segment': True,
+                'conversation_start': conversation.started_at
+            }
+            self._queue_memory_write((segment_data, self.current_person_id, False))
+    
+    def _queue_memory_write(self, job, timeout=2.0):
+        """Antre job untuk memory worker; kalau antrean tetap penuh setelah timeout, job di-drop"""
+        try:
+            self._memory_queue.put(job, timeout=timeout)
+        except queue.Full:
+            # Disk / memory worker macet: jangan tahan jalur respons
+            print("⚠ Memory write queue full, dropping {} messages".format(len(job[0].get('messages', ()))))
     
     def _start_new_conversation(self):
         """Start tracking a new conversation"""
-        self.current_conversation = {
-            'start_time': datetime.now(),
-            'messages': [],
-            'topics': [],
-            'electronics_analyses': [],
-            'movement_commands': [],
-            'person_id': self.current_person_id
-        }
+        with self._conversation_lock:
+            self.current_conversation = ConversationState(time.monotonic(), self.current_person_id)
         self.conversation_active = True
         self.conversation_started = True
         self.last_speech_time = time.time()
@@ -626,24 +925,17 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
                 person_data = self.memory.person_cache[self.current_person_id]
                 name = person_data.get('name', 'friend')
                 
-                recent_context = self.memory.get_conversation_context(self.current_person_id, limit=2)
+                _, recent_flags = self._conversation_context(self.current_person_id, limit=2)
                 
-                if 'electronics' in recent_context.lower():
-                    greeting = "Hello {}! Ready to dive into more electronics? I remember our fantastic discussions about circuits and components. I'm excited to explore more with you today! What's on your electronics mind?".format(name)
-                elif 'project' in recent_context.lower():
-                    greeting = "Hi {}! How's your project progressing? I've been thinking about our previous conversations. I'm here and ready to help you build something amazing! What's the next step?".format(name)
+                if recent_flags['electronics']:
+                    greeting = _KNOWN_GREETING_ELECTRONICS.format(name)
+                elif recent_flags['project']:
+                    greeting = _KNOWN_GREETING_PROJECT.format(name)
                 else:
-                    greeting = "Great to see you again, {}! I'm energized and ready for another exciting electronics conversation. What fascinating topic should we explore today?".format(name)
+                    greeting = _KNOWN_GREETING_DEFAULT.format(name)
                     
             else:
-                greetings = [
-                    "Hello! I'm Ellee, your passionate electronics assistant robot. I absolutely love helping with Arduino projects, teaching about circuits, and building amazing things together! What brings you here today?",
-                    "Hi there! I'm thrilled to meet you! I'm incredibly knowledgeable about electronics and genuinely excited to help with any projects or questions you have. What would you like to explore?",
-                    "Welcome! I specialize in electronics education and I'm genuinely enthusiastic about helping people learn and build. From basic LEDs to complex ESP32 projects - I'm here for it all! What interests you?"
-                ]
-                
-                import random
-                greeting = random.choice(greetings)
+                greeting = _choice(_STRANGER_GREETINGS)
             
             self._speak(greeting)
             
@@ -691,24 +983,26 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
     def _handle_list_projects_command(self):
         """List user's projects from memory"""
         try:
-            projects = list(self.memory.project_cache.values())
+            memory = self.memory
             
-            if not projects:
+            if not memory.project_cache:
                 response = "You don't have any saved projects yet. Would you like to save your current setup as a project or start a new one? I'm excited to help you build something amazing!"
             else:
-                active_projects = [p for p in projects if p['status'] in ['planning', 'in_progress']]
-                completed_projects = [p for p in projects if p['status'] == 'completed']
+                # Jumlah per status langsung dari index memory, tanpa scan project_cache
+                active_count = len(memory.active_project_ids)
+                completed_count = len(memory.completed_project_ids)
                 
-                response = "Here are your exciting projects: "
+                parts = [_PROJECTS_LIST_PREFIX]
                 
-                if active_projects:
-                    names = [p['name'] for p in active_projects[:3]]
-                    response += "You have {} active projects: {}. ".format(len(active_projects), ', '.join(names))
+                if active_count:
+                    names = ', '.join(map(_project_name, memory.get_active_projects(limit=3)))
+                    parts.append(_PROJECTS_LIST_ACTIVE.format(active_count, names))
                 
-                if completed_projects:
-                    response += "You've completed {} projects - that's awesome! ".format(len(completed_projects))
+                if completed_count:
+                    parts.append(_PROJECTS_LIST_COMPLETED.format(completed_count))
                 
-                response += "I'm thrilled to help you continue any of these, start something new, or answer any questions you have!"
+                parts.append(_PROJECTS_LIST_SUFFIX)
+                response = "".join(parts)
             
             self._speak(response)
             
@@ -722,8 +1016,8 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
     def _handle_continue_project_command(self, speech_text):
         """Handle continuing an existing project"""
         try:
-            projects = [p for p in self.memory.project_cache.values() 
-                       if p['status'] in ['planning', 'in_progress']]
+            # Cukup 3 project pertama: 1 untuk lanjut langsung, 3 untuk disebutkan
+            projects = self.memory.get_active_projects(limit=3)
             
             if not projects:
                 response = "I don't see any active projects to continue. Would you like to start a new exciting project or need help with something else?"
@@ -738,8 +1032,8 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
                 else:
                     response = "Perfect! Let's continue with '{}'. Show me your current progress and I'll help you figure out the exciting next steps.".format(project['name'])
             else:
-                project_names = [p['name'] for p in projects[:3]]
-                response = "You have multiple active projects: {}. Which one would you like to continue with? I'm ready to dive in!".format(', '.join(project_names))
+                project_names = ', '.join(map(_project_name, projects))
+                response = "You have multiple active projects: {}. Which one would you like to continue with? I'm ready to dive in!".format(project_names)
             
             self._speak(response)
             
@@ -780,12 +1074,12 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
         try:
             if self.current_project_id and self.current_project_id in self.memory.project_cache:
                 project = self.memory.project_cache[self.current_project_id]
-                response = "Your current project '{}' is in {} status. ".format(project['name'], project['status'])
-                
-                if 'next_steps' in project and project['next_steps']:
-                    response += "Next steps: {}. I'm excited to help you with whatever comes next! What would you like to work on?".format(', '.join(project['next_steps'][:2]))
+                next_steps = project.get('next_steps')
+                if next_steps:
+                    tail = _PROJECT_STATUS_NEXT_STEPS.format(', '.join(next_steps[:2]))
                 else:
-                    response += "What would you like to work on next? I'm here to help guide you!"
+                    tail = _PROJECT_STATUS_NO_STEPS
+                response = _PROJECT_STATUS.format(project['name'], project['status']) + tail
             else:
                 response = "You don't have an active project selected. Would you like to continue an existing project, start a new exciting one, or need help with something else?"
             
@@ -803,10 +1097,12 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
         try:
             stats = self.memory.get_memory_stats()
             
-            response = "Here's what I remember about our journey: I've had {} conversations with you, ".format(stats['total_conversations'])
-            response += "you have {} active projects and {} completed ones. ".format(stats['active_projects'], stats['completed_projects'])
-            response += "I'm storing about {} megabytes of memories about our interactions. ".format(stats['memory_size_mb'])
-            response += "I absolutely love learning about your electronics journey! What specific topic would you like to explore today?"
+            response = "".join((
+                _STATS_CONVERSATIONS.format(stats['total_conversations']),
+                _STATS_PROJECTS.format(stats['active_projects'], stats['completed_projects']),
+                _STATS_SIZE.format(stats['memory_size_mb']),
+                _STATS_SUFFIX,
+            ))
             
             self._speak(response)
             
@@ -820,38 +1116,20 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
     def _extract_project_from_analysis(self, analysis, speech_text):
         """Extract project data from vision analysis and speech"""
         
-        # Try to extract project name from speech
-        project_name = "Electronics Project"
-        if "call it" in speech_text.lower() or "name it" in speech_text.lower():
-            words = speech_text.split()
-            try:
-                name_start = None
-                for i, word in enumerate(words):
-                    if word.lower() in ["call", "name"]:
-                        name_start = i + 2  # Skip "call it" or "name it"
-                        break
-                
-                if name_start and name_start < len(words):
-                    project_name = " ".join(words[name_start:name_start+3])  # Take next 3 words
-            except:
-                pass
+        # Try to extract project name from speech ("call it X" / "name it X")
+        name_match = _PROJECT_NAME_RE.search(speech_text)
+        project_name = name_match.group(1) if name_match else "Electronics Project"
         
-        # Extract components from analysis
-        components = []
-        try:
-            analysis_text = analysis.get('analysis', '').lower()
-            common_components = ['arduino', 'led', 'resistor', 'breadboard', 'sensor', 'wire', 'capacitor', 'button']
-            for component in common_components:
-                if component in analysis_text:
-                    components.append(component.title())
-        except:
-            pass
+        # Extract components from analysis: satu scan regex untuk semua komponen
+        analysis_text = analysis.get('analysis') or ''
+        found = {m.group(1).lower() for m in _PROJECT_COMPONENT_RE.finditer(analysis_text)}
+        components = [component.title() for component in _PROJECT_COMPONENTS if component in found]
         
         # Determine difficulty
         difficulty = "beginner"
         if len(components) > 5:
             difficulty = "intermediate"
-        if any(word in analysis.get('analysis', '').lower() for word in ['complex', 'advanced', 'programming']):
+        if _PROJECT_ADVANCED_RE.search(analysis_text):
             difficulty = "advanced"
         
         return {
@@ -874,8 +1152,8 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
                 self._transition_to_listening()
                 return
             
-            context = self.memory.get_conversation_context(self.current_person_id, limit=3)
-            teaching_approach = self.memory.get_personalized_teaching_approach(self.current_person_id, "electronics")
+            context, context_flags = self._conversation_context(self.current_person_id, limit=3)
+            teaching_approach = self._teaching_approach(self.current_person_id, "electronics")
             
             command_type = self._is_electronics_command(speech_text)
             
@@ -889,17 +1167,19 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
                 # Add follow-up question to encourage more interaction
                 enhanced_response += " Is there anything specific you'd like to know about these components or any other questions?"
                 
-                self.current_conversation['electronics_analyses'].append({
-                    'timestamp': datetime.now().isoformat(),
+                # Satu timestamp untuk analysis record dan message-nya (kejadian yang sama)
+                now = time.time()
+                self.current_conversation.electronics_analyses.append({
+                    'timestamp': now,
                     'command_type': command_type,
                     'analysis': result['analysis'],
                     'success': True
                 })
                 
-                self.current_conversation['messages'].append({
+                self._append_message({
                     'role': 'assistant',
                     'content': enhanced_response,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now
                 })
                 
                 if self.project_mode and self.current_project_id:
@@ -912,7 +1192,7 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
                 self._speak(enhanced_response)
                 
             else:
-                error_response = self._get_contextual_error_response(context)
+                error_response = self._get_contextual_error_response(context_flags)
                 error_response += " What else would you like to explore or learn about?"
                 self._speak(error_response)
                 
@@ -951,15 +1231,15 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
         
         return intro + base_response + memory_suggestions
     
-    def _get_contextual_error_response(self, context):
-        """Get contextual error response based on memory"""
+    def _get_contextual_error_response(self, context_flags):
+        """Get contextual error response based on memory (flags dari _conversation_context)"""
         
-        if 'electronics' in context.lower():
+        if context_flags['electronics']:
             return "I'm having trouble with my vision analysis right now, but based on our previous electronics discussions, I can still help guide you through your project!"
         else:
             return "I can't see clearly right now, but I'm here to help with your electronics questions!"
     
-    def _handle_learning_state(self):
+    def _handle_learning_state(self, current_time):
         """Handle learning state - transition back to listening after a timeout"""
         time.sleep(3)  # Give time for learning processes
         if self.person_detected:
@@ -969,60 +1249,82 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
     
     def _end_current_conversation(self):
         """Enhanced conversation ending dengan movement data"""
-        if self.current_conversation.get('messages'):
+        # Ambil percakapan + snapshot messages-nya dan pasang record baru dalam satu langkah,
+        # supaya jawaban AI yang masuk bersamaan tidak ikut hilang di tengah snapshot
+        with self._conversation_lock:
+            conversation = self.current_conversation
+            messages = list(conversation.messages)
+            self.current_conversation = ConversationState()
+        
+        if messages:
             try:
                 # Calculate duration
-                if self.current_conversation.get('start_time'):
-                    duration = (datetime.now() - self.current_conversation['start_time']).total_seconds()
+                if conversation.start_time is not None:
+                    duration = time.monotonic() - conversation.start_time
                 else:
                     duration = 0
                 
-                # Prepare conversation data dengan movement info
+                # Prepare conversation data dengan movement info: snapshot lengkap (semua list
+                # baru), jadi aman diproses memory worker sementara percakapan baru dimulai
                 conversation_data = {
-                    'messages': self.current_conversation['messages'],
-                    'topics': self.current_conversation['topics'],
+                    'messages': _with_iso_timestamps(messages),
+                    'topics': list(conversation.topics),
                     'duration': duration,
-                    'electronics_analyses': self.current_conversation['electronics_analyses'],
-                    'movement_commands': self.current_conversation['movement_commands']  # Include movement data
+                    'electronics_analyses': _with_iso_timestamps(conversation.electronics_analyses),
+                    'movement_commands': _with_iso_timestamps(conversation.movement_commands),  # Include movement data
+                    'conversation_start': conversation.started_at
                 }
                 
-                # Save to memory
-                conv_id = self.memory.remember_conversation(
-                    conversation_data, 
-                    person_id=self.current_person_id
-                )
-                
-                movement_count = len(self.current_conversation['movement_commands'])
-                print("💾 Conversation saved to memory (ID: {}, Duration: {:.1f}s, Movements: {})".format(
-                    conv_id, duration, movement_count))
-                
-                # Learn from this interaction
-                self._learn_from_conversation(conversation_data)
+                # Save to memory + learn dilakukan memory worker
+                self._queue_memory_write((conversation_data, self.current_person_id, True))
                 
             except Exception as e:
                 print("⚠ Error saving conversation with movement data: {}".format(e))
         
-        # Reset conversation tracking
-        self.current_conversation = {
-            'start_time': None,
-            'messages': [],
-            'topics': [],
-            'electronics_analyses': [],
-            'movement_commands': []
-        }
+        # Reset conversation tracking (record baru sudah dipasang di atas)
         self.conversation_started = False
     
+    def _memory_worker(self):
+        """Worker thread memory: simpan percakapan dari _memory_queue satu per satu"""
+        while True:
+            job = self._memory_queue.get()
+            if job is None:  # Sentinel dari stop()
+                break
+            
+            conversation_data, person_id, learn = job
+            try:
+                conv_id = self.memory.remember_conversation(conversation_data, person_id=person_id)
+                if learn:
+                    print("💾 Conversation saved to memory (ID: {}, Duration: {:.1f}s, Movements: {})".format(
+                        conv_id, conversation_data['duration'], len(conversation_data['movement_commands'])))
+                    
+                    # Learn from this interaction
+                    self._learn_from_conversation(conversation_data)
+            except Exception as e:
+                print("⚠ Error saving conversation to memory: {}".format(e))
+    
     def _learn_from_conversation(self, conversation_data):
         """Learn patterns from the conversation"""
         try:
-            # Analyze for learning signals
+            # Analyze for learning signals: satu pass per message, tanpa menggabung
+            # seluruh isi percakapan jadi satu string
+            question_count = 0
+            positive_feedback = False
+            confusion = False
+            for message in conversation_data['messages']:
+                content = message.get('content', '')
+                if '?' in content:
+                    question_count += 1
+                if not positive_feedback and _POSITIVE_FEEDBACK_RE.search(content):
+                    positive_feedback = True
+                if not confusion and _CONFUSION_RE.search(content):
+                    confusion = True
+            
             learning_signals = {
                 'electronics_focus': len(conversation_data.get('electronics_analyses', [])) > 0,
-                'question_count': len([m for m in conversation_data['messages'] if '?' in m.get('content', '')]),
-                'positive_feedback': any(word in ' '.join([m.get('content', '') for m in conversation_data['messages']]).lower() 
-                                       for word in ['great', 'perfect', 'excellent', 'awesome', 'thanks']),
-                'confusion_indicators': any(word in ' '.join([m.get('content', '') for m in conversation_data['messages']]).lower() 
-                                          for word in ['confused', 'don\'t understand', 'what', 'huh'])
+                'question_count': question_count,
+                'positive_feedback': positive_feedback,
+                'confusion_indicators': confusion
             }
             
             # Update interaction metrics
@@ -1043,12 +1345,35 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
         except Exception as e:
             print("⚠ Error in learning process: {}".format(e))
     
+    def _status_inputs(self, is_speaking):
+        """Semua input get_enhanced_status() sebagai tuple; None kalau status tidak bisa di-cache"""
+        movement_key = None
+        if self.movement_enabled and self.motor_controller:
+            motor = self.motor_controller
+            if motor.is_moving:
+                return None  # movement_duration berubah terus selama bergerak
+            movement_key = (motor.total_movements, motor.current_action, motor.current_speed, motor.emergency_stop_active)
+        
+        return (
+            self.state, self.person_detected, is_speaking, self.conversation_active,
+            len(self.conversation_manager.conversation_history), self.memory.mutation_version,
+            self.current_project_id, self.project_mode, self.interaction_count,
+            self.successful_teachings, movement_key
+        )
+    
     def get_enhanced_status(self):
-        """Get enhanced robot status with memory info"""
+        """Get enhanced robot status with memory info (snapshot bersama, jangan diubah caller)"""
+        is_speaking = self.tts_engine.is_speaking()
+        
+        # Tidak ada yang berubah sejak panggilan terakhir: pakai snapshot yang sama
+        key = self._status_inputs(is_speaking)
+        if key is not None and key == self._status_key:
+            return self._status_cache
+        
         base_status = {
             "state": self.state.value,
             "person_detected": self.person_detected,
-            "is_speaking": self.tts_engine.is_speaking(),
+            "is_speaking": is_speaking,
             "conversation_length": len(self.conversation_manager.conversation_history),
             "conversation_active": self.conversation_active
         }
@@ -1085,12 +1410,15 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
             "movement_history": movement_history
         }
         
+        self._status_cache = enhanced_status
+        self._status_key = key
         return enhanced_status
     
     def stop(self):
         """Enhanced stop dengan movement cleanup"""
         if self.is_running:
             self.is_running = False
+            self._wake.set()
             
             # Stop movement first
             if self.movement_enabled and self.motor_controller:
@@ -1101,16 +1429,30 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
                     print(f"⚠ Error stopping movement: {e}")
             
             # Save ongoing conversation
-            if self.conversation_active and self.current_conversation.get('messages'):
+            if self.conversation_active and self.current_conversation.messages:
                 try:
                     self._end_current_conversation()
-                    print("💾 Saved final conversation with movement data")
+                    print("💾 Saving final conversation with movement data...")
                 except Exception as e:
                     print("⚠ Could not save final conversation: {}".format(e))
             
             if self.main_thread:
                 self.main_thread.join(timeout=3)
             
+            # Tunggu percakapan yang masih antre selesai ditulis (termasuk yang barusan)
+            if self._memory_thread:
+                self._memory_queue.put(None)
+                self._memory_thread.join(timeout=10)
+            
+            self._cancel_pending_ai()
+            if self._ai_thread:
+                self._ai_inbox.put(None)
+                self._ai_thread.join(timeout=3)
+            
+            if self._tts_thread:
+                self._tts_queue.put(None)
+                self._tts_thread.join(timeout=3)
+            
             self.speech_listener.stop_listening()
             self.vision_system.stop_capture()
             
@@ -1127,8 +1469,10 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
     # Helper methods untuk movement integration dan state transitions
     def _update_person_detection(self):
         """Update person detection status (same as original)"""
-        motion_detected = self.vision_system.detect_motion()
-        person_detected, bbox = self.vision_system.detect_person_simple()
+        # Satu frame bersama (tanpa copy) untuk kedua detector; keduanya hanya membaca
+        frame = self.vision_system.get_current_frame(copy=False)
+        motion_detected = self.vision_system.detect_motion(frame=frame)
+        person_detected, bbox = self.vision_system.detect_person_simple(frame=frame)
         
         if motion_detected or person_detected:
             self.person_detected = True
@@ -1137,82 +1481,117 @@ IMPORTANT: Keep responses conversational and engaging (2-4 sentences). Always so
             if time.time() - self.last_person_detection > self.person_timeout:
                 self.person_detected = False
     
+    def _enter_state(self, state, icon):
+        """Set state baru, log transisinya, dan bangunkan main loop"""
+        print("{} Transitioning to {}".format(icon, state.name))
+        self.state = state
+        self._wake.set()
+    
     def _transition_to_idle(self):
         if self.state != RobotState.IDLE:
-            print("💤 Transitioning to IDLE")
-            self.state = RobotState.IDLE
+            self._enter_state(RobotState.IDLE, "💤")
             self.speech_listener.stop_listening()
     
     def _transition_to_engaging(self):
-        print("👋 Transitioning to ENGAGING")
-        self.state = RobotState.ENGAGING
+        self._enter_state(RobotState.ENGAGING, "👋")
     
     def _transition_to_listening(self):
         """Transition to listening with improved thread management"""
+        listener = self.speech_listener
         if self.state != RobotState.LISTENING:
-            print("👂 Transitioning to LISTENING")
-            self.state = RobotState.LISTENING
+            self._enter_state(RobotState.LISTENING, "👂")
             
             # Ensure clean transition by stopping any existing listening
             try:
-                self.speech_listener.stop_listening()
+                listener.stop_listening()
                 time.sleep(0.1)  # Brief pause to ensure clean stop
             except:
                 pass
             
             # Start listening
-            self.speech_listener.start_listening()
+            listener.start_listening()
         else:
             # Already in listening state, just ensure we're actually listening
-            if not self.speech_listener.is_listening:
-                self.speech_listener.start_listening()
+            if not listener.is_listening:
+                listener.start_listening()
     
     def _transition_to_thinking(self):
-        print("🤔 Transitioning to THINKING")
-        self.state = RobotState.THINKING
+        self._enter_state(RobotState.THINKING, "🤔")
         self.speech_listener.stop_listening()
     
     def _transition_to_speaking(self):
-        print("🗣 Transitioning to SPEAKING")
-        self.state = RobotState.SPEAKING
+        self._enter_state(RobotState.SPEAKING, "🗣")
         self.speech_listener.stop_listening()
     
     def _transition_to_learning(self):
-        print("📚 Transitioning to LEARNING")
-        self.state = RobotState.LEARNING
+        self._enter_state(RobotState.LEARNING, "📚")
         self.speech_listener.stop_listening()
     
     def _transition_to_moving(self):
         """Transition to moving state"""
         if self.state != RobotState.MOVING:
-            print("🚶 Transitioning to MOVING")
-            self.state = RobotState.MOVING
+            self._enter_state(RobotState.MOVING, "🚶")
             # Keep speech listener active untuk stop commands
     
     def _speak(self, text):
         """Enhanced speak dengan movement awareness"""
         print("🗣 Enhanced Ellee: {}".format(text))
         
+        self._hold_speaking()
+        
+        # TTS worker yang synthesize + play; caller tidak ter-block
+        self._tts_queue.put(text)
+    
+    def _hold_speaking(self):
+        """Ambil satu token speaking: state tetap SPEAKING (mic mati) sampai semua token dilepas"""
+        with self._tts_pending_lock:
+            self._tts_pending += 1
+        self._begin_speaking()
+    
+    def _release_speaking(self):
+        """Lepas satu token speaking; token terakhir mengakhiri speaking"""
+        with self._tts_pending_lock:
+            self._tts_pending -= 1
+            done = self._tts_pending == 0
+        if done:
+            self._finish_speaking()
+    
+    def _tts_worker(self):
+        """Worker thread TTS: ucapkan teks dari antrean satu per satu"""
+        while True:
+            text = self._tts_queue.get()
+            if text is None:  # Sentinel dari stop()
+                break
+            
+            try:
+                self.tts_engine.speak(text)
+            except Exception as e:
+                print("⚠ TTS error: {}".format(e))
+            
+            self._release_speaking()
+    
+    def _begin_speaking(self):
+        """Tandai TTS aktif (termasuk saat synthesis, sebelum audio benar-benar diputar)"""
+        self._tts_busy.set()
         # Don't transition to speaking if currently moving (allow movement + speech)
-        if self.state != RobotState.MOVING:
+        if self.state != RobotState.MOVING and self.state != RobotState.SPEAKING:
             self._transition_to_speaking()
-        
-        # Use a thread to handle TTS without blocking
-        def speak_and_return():
-            self.tts_engine.speak(text)
-            # After speaking, return to appropriate state
-            if self.state == RobotState.SPEAKING:  # Only if we were in speaking state
-                if self.conversation_active and self.person_detected:
-                    self._transition_to_listening()
-                elif not self.person_detected:
-                    self._transition_to_idle()
-        
-        threading.Thread(target=speak_and_return, daemon=True).start()
+    
+    def _finish_speaking(self):
+        """TTS selesai: kembali ke state yang sesuai"""
+        self._tts_busy.clear()
+        self._wake.set()  # Main loop langsung cek state, tidak tunggu tick berikutnya
+        # After speaking, return to appropriate state
+        if self.state == RobotState.SPEAKING:  # Only if we were in speaking state
+            if self.conversation_active and self.person_detected:
+                self._transition_to_listening()
+            elif not self.person_detected:
+                self._transition_to_idle()
 
 # Test function
 def test_enhanced_brain_with_movement():
     """Test enhanced brain dengan movement capabilities"""
-    from config import Config
+    from config import get_config
     
     print("Testing Enhanced Ellee Brain with Movement...")
     print("This will test the full robot with movement capabilities")
@@ -1225,7 +1604,7 @@ def test_enhanced_brain_with_movement():
     print("- 'Stop'")
     
     try:
-        brain = EnhancedElleeBrainWithMovement(Config)
+        brain = EnhancedElleeBrainWithMovement(get_config())
         brain.start()
         
         # Run for 60 seconds to test movement integration
@@ -38,6 +38,9 @@ class ElleeMotorController(SOMEBODY4MotorController):
         self.movement_history = []
         self.total_movements = 0
         
+        # Listener opsional: callback(status_dict) dipanggil tiap start/stop movement
+        self.on_state_change = None
+        
         print("🤖 Enhanced Ellee Motor Controller initialized!")
         print(f"   Default Speed: {self.default_speed}%")
         print(f"   Max Safe Speed: {self.max_safe_speed}%")
@@ -65,12 +68,15 @@ class ElleeMotorController(SOMEBODY4MotorController):
             threading.Thread(target=self._movement_timeout_check, daemon=True).start()
             
             print(f"🚀 Starting movement: {action_name}")
-            return True
+        
+        self._notify_state_change()
+        return True
     
     def _end_movement(self):
         """End movement tracking"""
         with self.safety_lock:
-            if self.is_moving:
+            was_moving = self.is_moving
+            if was_moving:
                 duration = time.time() - self.movement_start_time if self.movement_start_time else 0
                 
                 # Record movement history
@@ -90,6 +96,18 @@ class ElleeMotorController(SOMEBODY4MotorController):
             self.is_moving = False
             self.current_action = "stopped"
             self.movement_start_time = None
+        
+        if was_moving:
+            self._notify_state_change()
+    
+    def _notify_state_change(self):
+        """Kirim status terbaru ke listener on_state_change (dipanggil di luar safety_lock)"""
+        callback = self.on_state_change
+        if callback is not None:
+            try:
+                callback(self.get_movement_status())
+            except Exception as e:
+                print(f"⚠️ Movement state listener error: {e}")
     
     def _movement_timeout_check(self):
         """Safety timeout untuk auto-stop movement"""
@@ -4,6 +4,7 @@ import pyaudio
 import threading
 import time
 import queue
+from collections import deque
 
 class FixedSpeechListener:
     def __init__(self, config):
@@ -178,8 +179,21 @@ class FixedSpeechListener:
 class ConversationManager:
     def __init__(self, config):
         self.config = config
-        self.conversation_history = []
         self.max_history = config.MAX_CONVERSATION_HISTORY
+        # deque dengan maxlen: pesan lama terbuang otomatis, tanpa slice + list baru per pesan
+        self.conversation_history = deque(maxlen=self.max_history)
+        
+        # Enhanced system message untuk electronics assistant (teks tetap, dibuat sekali)
+        self.system_prompt = (
+            f"You are {config.ROBOT_NAME}, a friendly and knowledgeable electronics assistant robot. "
+            f"You are enthusiastic about electronics, Arduino projects, and helping people learn. "
+            f"You speak in a conversational, detailed way - not too brief or robotic. "
+            f"You love to explain things clearly and give practical examples. "
+            f"You can see through your camera and recognize electronic components. "
+            f"When discussing projects, be specific about steps, components, and safety tips. "
+            f"Always be encouraging and patient, especially with beginners. "
+            f"Your responses should be 2-4 sentences long to be more conversational and helpful."
+        )
     
     def add_message(self, role, content):
         """Tambah pesan ke history"""
@@ -187,46 +201,35 @@ class ConversationManager:
             "role": role,
             "content": content
         })
-        
-        # Limit history size
-        if len(self.conversation_history) > self.max_history:
-            self.conversation_history = self.conversation_history[-self.max_history:]
     
-    def get_conversation_for_ai(self):
+    def get_conversation_for_ai(self, system_prompt=None):
         """Format conversation untuk AI dengan personality yang lebih detailed"""
-        # Enhanced system message untuk electronics assistant
+        # system_prompt: override system message (default: self.system_prompt)
         messages = [{
             "role": "system",
-            "content": f"You are {self.config.ROBOT_NAME}, a friendly and knowledgeable electronics assistant robot. "
-                      f"You are enthusiastic about electronics, Arduino projects, and helping people learn. "
-                      f"You speak in a conversational, detailed way - not too brief or robotic. "
-                      f"You love to explain things clearly and give practical examples. "
-                      f"You can see through your camera and recognize electronic components. "
-                      f"When discussing projects, be specific about steps, components, and safety tips. "
-                      f"Always be encouraging and patient, especially with beginners. "
-                      f"Your responses should be 2-4 sentences long to be more conversational and helpful."
+            "content": self.system_prompt if system_prompt is None else system_prompt
         }]
         
-        # Add conversation history
+        # Add conversation history (maksimal max_history pesan, jadi biaya per turn tetap)
         messages.extend(self.conversation_history)
         
         return messages
     
     def clear_history(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
         print("🧠 Conversation history cleared")
 
 # Test function yang aman
 def test_fixed_speech():
     """Test fixed speech recognition"""
-    from config import Config
+    from config import get_config
     
     print("Testing Fixed Speech Recognition...")
     print("This will test microphone with improved error handling")
     
     try:
-        listener = FixedSpeechListener(Config)
+        listener = FixedSpeechListener(get_config())
         listener.start_listening()
         
         print("\n🎤 Microphone is ready!")
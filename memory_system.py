@@ -1,21 +1,29 @@
 # memory_system.py - Advanced memory and learning system for Ellee (Python 3.6 Compatible)
 import json
+import gzip
 import os
 import sqlite3
 import pickle
 import time
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
+from itertools import islice
+from operator import itemgetter
 import threading
 import hashlib
 import cv2
 import numpy as np
 
+# Status project yang dihitung sebagai aktif (lihat index di ElleeBrainMemory._index_project)
+_ACTIVE_STATUSES = frozenset(('planning', 'in_progress'))
+_project_name = itemgetter('name')
+
 # Python 3.6 compatible data classes using regular classes
 class ConversationMemory(object):
     """Memory of a single conversation"""
     def __init__(self, timestamp=None, person_id=None, duration=0.0, messages=None, 
-                 topics=None, sentiment="neutral", electronics_analysis=None, learned_preferences=None):
+                 topics=None, sentiment="neutral", electronics_analysis=None, learned_preferences=None,
+                 segment=False, conversation_start=None):
         self.timestamp = timestamp or datetime.now().isoformat()
         self.person_id = person_id
         self.duration = duration
@@ -24,6 +32,10 @@ class ConversationMemory(object):
         self.sentiment = sentiment
         self.electronics_analysis = electronics_analysis
         self.learned_preferences = learned_preferences or {}
+        # segment=True: potongan percakapan yang masih berjalan (buffer brain penuh), bukan
+        # akhir percakapan; conversation_start menghubungkan segmen dengan percakapannya
+        self.segment = segment
+        self.conversation_start = conversation_start
     
     def to_dict(self):
         return {
@@ -34,7 +46,9 @@ class ConversationMemory(object):
             'topics': self.topics,
             'sentiment': self.sentiment,
             'electronics_analysis': self.electronics_analysis,
-            'learned_preferences': self.learned_preferences
+            'learned_preferences': self.learned_preferences,
+            'segment': self.segment,
+            'conversation_start': self.conversation_start
         }
 
 class ProjectMemory(object):
@@ -117,6 +131,20 @@ class ElleeBrainMemory:
         self.project_cache = {}
         self.context_memory = {}
         
+        # Index project_id per status, di-update setiap project disimpan / status berubah,
+        # jadi listing tidak perlu scan project_cache. Dict (value None) sebagai ordered set:
+        # urutan tetap urutan project masuk cache.
+        self.active_project_ids = {}
+        self.completed_project_ids = {}
+        
+        # Naik setiap kali isi cache berubah (conversation/project/person), supaya pemakai
+        # bisa memo hasil turunan (mis. get_conversation_context) dan tahu kapan basi
+        self.mutation_version = 0
+        
+        # Memo get_memory_stats() (os.walk folder memory), valid selama mutation_version sama
+        self._stats_cache = None
+        self._stats_cache_version = None
+        
         # Learning metrics
         self.interaction_patterns = defaultdict(list)
         self.learning_progress = defaultdict(dict)
@@ -261,6 +289,7 @@ class ElleeBrainMemory:
                         with open(project_file, 'r') as f:
                             project_data = json.load(f)
                             self.project_cache[project_id] = project_data
+                            self._index_project(project_id, project_data.get('status'))
                             
         except Exception as e:
             print(f"Warning: Could not load some memories: {e}")
@@ -285,7 +314,9 @@ class ElleeBrainMemory:
                     topics=analysis.get('topics', []),
                     sentiment=analysis.get('sentiment', 'neutral'),
                     electronics_analysis=analysis.get('electronics_analysis'),
-                    learned_preferences=analysis.get('learned_preferences', {})
+                    learned_preferences=analysis.get('learned_preferences', {}),
+                    segment=conversation_data.get('segment', False),
+                    conversation_start=conversation_data.get('conversation_start')
                 )
                 
                 # Save to cache
@@ -318,15 +349,21 @@ class ElleeBrainMemory:
                 
                 # Update person memory if person identified
                 if person_id:
-                    self._update_person_memory(person_id, conv_memory)
+                    # Segmen bukan interaksi baru: interaksi dihitung sekali, saat percakapan selesai
+                    self._update_person_memory(person_id, conv_memory, count_interaction=not conv_memory.segment)
                 
                 return conv_id
                 
             except Exception as e:
                 print("Error remembering conversation: {}".format(e))
                 return None
+            
+            finally:
+                # Selalu naik (juga kalau DB/file gagal): conversation_cache / person_cache
+                # bisa sudah berubah sebelum error, memo di luar jangan tetap dipakai
+                self.mutation_version += 1
     
-    def _update_person_memory(self, person_id, conv_memory):
+    def _update_person_memory(self, person_id, conv_memory, count_interaction=True):
         """Update person memory based on conversation"""
         try:
             if person_id not in self.person_cache:
@@ -335,14 +372,15 @@ class ElleeBrainMemory:
                     person_id=person_id,
                     first_met=datetime.now().isoformat(),
                     last_interaction=datetime.now().isoformat(),
-                    total_interactions=1
+                    total_interactions=1 if count_interaction else 0
                 )
                 self.person_cache[person_id] = person_data.to_dict()
             else:
                 # Update existing person
                 person = self.person_cache[person_id]
                 person['last_interaction'] = datetime.now().isoformat()
-                person['total_interactions'] = person.get('total_interactions', 0) + 1
+                if count_interaction:
+                    person['total_interactions'] = person.get('total_interactions', 0) + 1
                 
                 # Update interests based on conversation topics
                 for topic in conv_memory.topics:
@@ -487,7 +525,7 @@ class ElleeBrainMemory:
                 )
                 
                 # Save to cache
-                self.project_cache[project_id] = project_memory.to_dict()
+                self.cache_project(project_id, project_memory.to_dict())
                 
                 # Save to database
                 with sqlite3.connect(self.db_path) as conn:
@@ -526,39 +564,74 @@ class ElleeBrainMemory:
         
         with self.memory_lock:
             if project_id in self.project_cache:
-                project = self.project_cache[project_id]
-                
-                # Update fields
-                if 'status' in progress_data:
-                    project['status'] = progress_data['status']
-                
-                if 'learned_lessons' in progress_data:
-                    project['learned_lessons'].extend(progress_data['learned_lessons'])
-                
-                if 'next_steps' in progress_data:
-                    project['next_steps'] = progress_data['next_steps']
-                
-                # Save progress image
-                if image is not None:
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    image_filename = f"{project_id}_{timestamp}.jpg"
-                    image_path = os.path.join(self.memory_dir, "images", image_filename)
-                    cv2.imwrite(image_path, image)
-                    project['progress_images'].append(image_filename)
-                
-                project['last_modified'] = datetime.now().isoformat()
-                
-                # Save to file
-                project_file = os.path.join(self.memory_dir, "projects", "{}.json".format(project_id))
-                with open(project_file, 'w') as f:
-                    json.dump(project, f, indent=2)
-                
-                print("📝 Updated project {} progress".format(project['name']))
+                try:
+                    self._update_project_fields(project_id, progress_data, image)
+                finally:
+                    # Field project bisa sudah berubah walaupun simpan image/file gagal
+                    self.mutation_version += 1
+    
+    def _update_project_fields(self, project_id, progress_data, image):
+        """Terapkan progress_data ke project di cache lalu simpan ke file (memory_lock dipegang)"""
+        project = self.project_cache[project_id]
+        
+        # Update fields
+        if 'status' in progress_data:
+            project['status'] = progress_data['status']
+            self._index_project(project_id, project['status'])
+        
+        if 'learned_lessons' in progress_data:
+            project['learned_lessons'].extend(progress_data['learned_lessons'])
+        
+        if 'next_steps' in progress_data:
+            project['next_steps'] = progress_data['next_steps']
+        
+        # Save progress image
+        if image is not None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            image_filename = f"{project_id}_{timestamp}.jpg"
+            image_path = os.path.join(self.memory_dir, "images", image_filename)
+            cv2.imwrite(image_path, image)
+            project['progress_images'].append(image_filename)
+        
+        project['last_modified'] = datetime.now().isoformat()
+        
+        # Save to file
+        project_file = os.path.join(self.memory_dir, "projects", "{}.json".format(project_id))
+        with open(project_file, 'w') as f:
+            json.dump(project, f, indent=2)
+        
+        print("📝 Updated project {} progress".format(project['name']))
+    
+    def cache_project(self, project_id, project):
+        """Simpan/ganti project di project_cache (pakai ini, jangan assign dict langsung)"""
+        with self.memory_lock:
+            self.project_cache[project_id] = project
+            self._index_project(project_id, project.get('status'))
+            self.mutation_version += 1
+    
+    def _index_project(self, project_id, status):
+        """Pindahkan project_id ke index status yang sesuai (active / completed / tidak keduanya)"""
+        self.active_project_ids.pop(project_id, None)
+        self.completed_project_ids.pop(project_id, None)
+        if status in _ACTIVE_STATUSES:
+            self.active_project_ids[project_id] = None
+        elif status == 'completed':
+            self.completed_project_ids[project_id] = None
+    
+    def get_active_projects(self, limit=None):
+        """Project aktif (planning / in_progress) dari index, paling banyak `limit`"""
+        # islice langsung di index: hanya `limit` id pertama yang disentuh, tanpa list semua id
+        return [self.project_cache[pid] for pid in islice(self.active_project_ids, limit)]
     
     def get_conversation_context(self, person_id=None, limit=5):
         """Get conversation context for AI"""
         """Get conversation context for AI"""
         
+        with self.memory_lock:  # Cache bisa sedang ditulis brain memory worker
+            return self._build_conversation_context(person_id, limit)
+    
+    def _build_conversation_context(self, person_id, limit):
+        """Susun context string dari cache (dipanggil dengan memory_lock dipegang)"""
         contexts = []
         
         # Recent conversations
@@ -572,10 +645,9 @@ class ElleeBrainMemory:
                 contexts.append("Recent topic: {}".format(topics))
         
         # Active projects
-        active_projects = [p for p in self.project_cache.values() if p['status'] in ['planning', 'in_progress']]
+        active_projects = self.get_active_projects(limit=3)
         if active_projects:
-            project_names = [p['name'] for p in active_projects[:3]]
-            contexts.append("Current projects: {}".format(', '.join(project_names)))
+            contexts.append("Current projects: {}".format(', '.join(map(_project_name, active_projects))))
         
         # Person preferences
         if person_id and person_id in self.person_cache:
@@ -648,14 +720,20 @@ class ElleeBrainMemory:
         """Get memory system statistics"""
         """Get memory system statistics"""
         
-        return {
-            'total_conversations': len(self.conversation_cache),
-            'known_people': len(self.person_cache),
-            'active_projects': len([p for p in self.project_cache.values() if p['status'] in ['planning', 'in_progress']]),
-            'completed_projects': len([p for p in self.project_cache.values() if p['status'] == 'completed']),
-            'memory_size_mb': self._calculate_memory_size(),
-            'last_interaction': max([c.get('timestamp', '') for c in self.conversation_cache]) if self.conversation_cache else 'Never'
-        }
+        # Dihitung ulang hanya kalau memory berubah sejak panggilan terakhir;
+        # dict hasilnya dipakai bersama, jangan diubah oleh caller
+        with self.memory_lock:
+            if self._stats_cache_version != self.mutation_version:
+                self._stats_cache = {
+                    'total_conversations': sum(1 for c in self.conversation_cache if not c.get('segment')),
+                    'known_people': len(self.person_cache),
+                    'active_projects': len(self.active_project_ids),
+                    'completed_projects': len(self.completed_project_ids),
+                    'memory_size_mb': self._calculate_memory_size(),
+                    'last_interaction': max([c.get('timestamp', '') for c in self.conversation_cache]) if self.conversation_cache else 'Never'
+                }
+                self._stats_cache_version = self.mutation_version
+            return self._stats_cache
     
     def _calculate_memory_size(self):
         """Calculate approximate memory usage in MB"""
@@ -684,7 +762,12 @@ class ElleeBrainMemory:
             'stats': self.get_memory_stats()
         }
         
-        with open(export_path, 'w') as f:
+        # Path *.gz ditulis sebagai gzip (compresslevel 3: cepat di SD card, ukuran ~5-10x lebih kecil)
+        if export_path.endswith('.gz'):
+            f = gzip.open(export_path, 'wt', compresslevel=3)
+        else:
+            f = open(export_path, 'w')
+        with f:
             json.dump(export_data, f, indent=2)
         
         print("💾 Memories exported to {}".format(export_path))
@@ -701,17 +784,18 @@ class ElleeBrainMemory:
             c for c in self.conversation_cache 
             if c.get('timestamp', '') > cutoff_str
         ], maxlen=100)
+        self.mutation_version += 1
         
         print("🧹 Cleaned up memories older than {} days".format(days_to_keep))
 
 # Test function
 def test_memory_system():
     """Test the enhanced memory system"""
-    from config import Config
+    from config import get_config
     
     print("Testing Enhanced Memory System...")
     
-    memory = ElleeBrainMemory(Config)
+    memory = ElleeBrainMemory(get_config())
     
     # Test conversation memory
     sample_conversation = {
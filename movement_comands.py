@@ -308,12 +308,11 @@ class MovementCommandProcessor:
         if not voice_text:
             return False
         
-        text = voice_text.lower().strip()
-        
+        # Tanpa lower()/strip(): search sudah IGNORECASE, jadi tidak perlu copy string per utterance
         # Check all command patterns
         for command_type, patterns in self.command_patterns.items():
             for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
+                if re.search(pattern, voice_text, re.IGNORECASE):
                     return True
         
         return False
@@ -166,14 +166,7 @@ class OpenAIClient:
         # Rate limiting
         self._rate_limit_wait()
         
-        # Use default model if none specified
-        if model is None:
-            model = self.default_model
-        
-        # Ensure model is available
-        if self.available_models and model not in self.available_models:
-            print(f"⚠️ Model {model} not available, using fallback")
-            model = self._get_fallback_chat_model()
+        model = self._resolve_chat_model(model)
         
         url = f"{self.base_url}/chat/completions"
         
@@ -233,6 +226,108 @@ class OpenAIClient:
         print("❌ All chat completion attempts failed")
         return None
     
+    def chat_completion_stream(self, messages, model=None, max_tokens=150, temperature=0.7, **kwargs):
+        """
+        Chat completion dengan stream=True: yield potongan teks begitu diterima
+        
+        Args sama dengan chat_completion. Retry hanya sebelum token pertama;
+        error jaringan di tengah stream di-raise ke pemanggil.
+        
+        Yields:
+            str: potongan (delta) teks response
+        """
+        
+        if not messages:
+            return
+        
+        # Rate limiting
+        self._rate_limit_wait()
+        
+        model = self._resolve_chat_model(model)
+        
+        url = f"{self.base_url}/chat/completions"
+        
+        data = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True,
+            **kwargs
+        }
+        
+        for attempt in range(self.max_retries):
+            try:
+                response = requests.post(
+                    url, 
+                    headers=self.headers, 
+                    json=data, 
+                    timeout=self.request_timeout,
+                    stream=True
+                )
+                
+                if response.status_code == 200:
+                    try:
+                        yield from self._iter_stream_deltas(response)
+                    finally:
+                        response.close()
+                    return
+                    
+                elif response.status_code == 429:  # Rate limit
+                    wait_time = (attempt + 1) * 2
+                    print(f"⏳ Rate limited, waiting {wait_time}s...")
+                    time.sleep(wait_time)
+                    continue
+                    
+                elif response.status_code == 401:  # Auth error
+                    print("❌ OpenAI API authentication failed")
+                    return
+                    
+                else:
+                    print(f"⚠️ API error {response.status_code}: {response.text}")
+                    
+            except requests.exceptions.Timeout:
+                print(f"⏰ Request timeout, attempt {attempt + 1}")
+                
+            except requests.exceptions.RequestException as e:
+                print(f"🌐 Network error: {e}, attempt {attempt + 1}")
+            
+            # Wait before retry
+            if attempt < self.max_retries - 1:
+                time.sleep(2 ** attempt)  # Exponential backoff
+        
+        print("❌ All streaming chat completion attempts failed")
+    
+    def _iter_stream_deltas(self, response):
+        """Parse server-sent events dari response stream, yield content delta"""
+        response.encoding = 'utf-8'  # text/event-stream tanpa charset, jangan ditebak requests
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data: "):
+                continue
+            
+            payload = line[6:]
+            if payload == "[DONE]":
+                break
+            
+            choices = json.loads(payload).get('choices')
+            if choices:
+                content = choices[0].get('delta', {}).get('content')
+                if content:
+                    yield content
+    
+    def _resolve_chat_model(self, model):
+        """Model default kalau None, fallback kalau tidak tersedia"""
+        # Use default model if none specified
+        if model is None:
+            model = self.default_model
+        
+        # Ensure model is available
+        if self.available_models and model not in self.available_models:
+            print(f"⚠️ Model {model} not available, using fallback")
+            model = self._get_fallback_chat_model()
+        
+        return model
+    
     def _get_fallback_chat_model(self):
         """Get fallback chat model"""
         fallback_models = ["gpt-3.5-turbo", "gpt-4", "gpt-3.5-turbo-0613"]
@@ -604,13 +699,13 @@ class OpenAIClientWithFallback(OpenAIClient):
 # Test functions
 def test_openai_wrapper():
     """Test complete OpenAI wrapper functionality"""
-    from config import Config
+    from config import get_config
     
     print("🧪 Testing Complete OpenAI Wrapper...")
     print("=" * 50)
     
     try:
-        client = OpenAIClient(Config.OPENAI_API_KEY)
+        client = OpenAIClient(get_config().OPENAI_API_KEY)
         
         # Test 1: Chat completion
         print("\n🗣️ Testing Chat Completion...")
@@ -668,13 +763,13 @@ def test_openai_wrapper():
 
 def test_backward_compatibility():
     """Test backward compatibility dengan existing code"""
-    from config import Config
+    from config import get_config
     
     print("🔄 Testing Backward Compatibility...")
     
     try:
         # Test original import pattern
-        client = OpenAIClient(Config.OPENAI_API_KEY)
+        client = OpenAIClient(get_config().OPENAI_API_KEY)
         
         # Test methods yang digunakan dalam brain_module.py
         messages = [
@@ -451,7 +451,7 @@ class AdvancedProjectManager:
                 'learned_lessons': [],
                 'next_steps': []
             }
-            self.memory.project_cache[project_id] = project_data_for_memory
+            self.memory.cache_project(project_id, project_data_for_memory)
             
             # Save to file
             project_file = os.path.join(self.projects_dir, "{}.json".format(project_id))
@@ -651,7 +651,7 @@ class AdvancedProjectManager:
             project = self.active_projects[project_id]
             
             # Update memory cache
-            self.memory.project_cache[project_id] = project
+            self.memory.cache_project(project_id, project)
             
             # Save to file
             project_file = os.path.join(self.projects_dir, "{}.json".format(project_id))
@@ -702,16 +702,16 @@ class AdvancedProjectManager:
 # Test function
 def test_project_manager():
     """Test advanced project manager"""
-    from config import Config
+    from config import get_config
     from memory_system import ElleeBrainMemory
     
     print("Testing Advanced Project Manager...")
     
     # Initialize memory system first
-    memory = ElleeBrainMemory(Config)
+    memory = ElleeBrainMemory(get_config())
     
     # Initialize project manager
-    pm = AdvancedProjectManager(Config, memory)
+    pm = AdvancedProjectManager(get_config(), memory)
     
     # Test component-based project suggestions
     detected_components = ["Arduino Uno", "LED", "Resistor", "Breadboard"]
@@ -330,10 +330,10 @@ class SmartElectronicsAnalyzer:
 # Test function
 def test_smart_analyzer():
     """Test smart electronics analyzer"""
-    from config import Config
+    from config import get_config
     
     print("Testing Smart Electronics Analyzer with GPT Vision...")
-    analyzer = SmartElectronicsAnalyzer(Config)
+    analyzer = SmartElectronicsAnalyzer(get_config())
     
     # Test with camera
     cap = cv2.VideoCapture(0)
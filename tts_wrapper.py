@@ -107,10 +107,10 @@ class TTSEngine:
 # Test function
 def test_tts_wrapper():
     """Test TTS wrapper"""
-    from config import Config
+    from config import get_config
     
     print("Testing TTS Engine...")
-    tts = TTSEngine(Config)
+    tts = TTSEngine(get_config())
     
     test_text = "Hello, I am Ellee, your friendly robot assistant!"
     print(f"Speaking: {test_text}")
@@ -5,6 +5,10 @@ import time
 import numpy as np
 from PIL import Image
 
+# Range warna kulit (HSV) untuk detect_person_simple, dibuat sekali saat import
+SKIN_HSV_LOWER = np.array([0, 20, 70], dtype=np.uint8)
+SKIN_HSV_UPPER = np.array([20, 255, 255], dtype=np.uint8)
+
 class VisionSystem:
     def __init__(self, config):
         self.config = config
@@ -13,6 +17,7 @@ class VisionSystem:
         self.current_frame = None
         self.capture_thread = None
         self.frame_lock = threading.Lock()
+        self.frame_ready = threading.Event()  # Di-set capture worker tiap ada frame baru
         
         # Initialize camera
         self._init_camera()
@@ -51,26 +56,40 @@ class VisionSystem:
     def _capture_worker(self):
         """Worker thread untuk capture frames"""
         while self.is_running:
+            # read() sudah block sampai frame berikutnya (~30 FPS), jadi tidak perlu sleep;
+            # sleep tambahan bikin buffer kamera menumpuk dan frame yang dibaca jadi basi
             ret, frame = self.camera.read()
             if ret:
+                # read() mengalokasi array baru tiap frame, jadi tidak perlu di-copy lagi.
+                # Read-only supaya reader yang pakai copy=False tidak bisa mengubah frame bersama.
+                frame.flags.writeable = False
                 with self.frame_lock:
-                    self.current_frame = frame.copy()
-            time.sleep(0.033)  # ~30 FPS
+                    self.current_frame = frame
+                self.frame_ready.set()
+            else:
+                time.sleep(0.033)
+    
+    def wait_for_frame(self, timeout=0.1):
+        """Block sampai capture worker menyimpan frame baru; False kalau timeout"""
+        ready = self.frame_ready.wait(timeout)
+        self.frame_ready.clear()
+        return ready
     
-    def get_current_frame(self):
-        """Ambil frame saat ini"""
+    def get_current_frame(self, copy=True):
+        """Ambil frame saat ini (copy=False: frame bersama read-only, tanpa copy)"""
         with self.frame_lock:
-            if self.current_frame is not None:
-                return self.current_frame.copy()
-        return None
+            frame = self.current_frame
+        if frame is not None and copy:
+            return frame.copy()
+        return frame
     
-    def detect_motion(self, threshold=5000):
+    def detect_motion(self, threshold=5000, frame=None):
         """Deteksi gerakan sederhana"""
         if not hasattr(self, '_prev_frame'):
             self._prev_frame = None
             return False
         
-        current = self.get_current_frame()
+        current = frame if frame is not None else self.get_current_frame(copy=False)
         if current is None:
             return False
         
@@ -78,11 +97,9 @@ class VisionSystem:
         current_gray = cv2.cvtColor(current, cv2.COLOR_BGR2GRAY)
         
         if self._prev_frame is not None:
-            # Calculate difference
-            diff = cv2.absdiff(self._prev_frame, current_gray)
-            
-            # Calculate amount of change
-            change_amount = np.sum(diff)
+            # Amount of change = sum |prev - current|; cv2.norm L1 menghitung absdiff + sum
+            # dalam satu pass C tanpa mengalokasi array diff
+            change_amount = cv2.norm(self._prev_frame, current_gray, cv2.NORM_L1)
             
             self._prev_frame = current_gray
             return change_amount > threshold
@@ -90,9 +107,10 @@ class VisionSystem:
         self._prev_frame = current_gray
         return False
     
-    def detect_person_simple(self):
+    def detect_person_simple(self, frame=None):
         """Deteksi orang sederhana menggunakan background subtraction"""
-        frame = self.get_current_frame()
+        if frame is None:
+            frame = self.get_current_frame(copy=False)
         if frame is None:
             return False, None
         
@@ -100,12 +118,8 @@ class VisionSystem:
         # Convert to HSV for better color detection
         hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
         
-        # Define skin color range (simple approximation)
-        lower_skin = np.array([0, 20, 70], dtype=np.uint8)
-        upper_skin = np.array([20, 255, 255], dtype=np.uint8)
-        
-        # Create mask for skin color
-        skin_mask = cv2.inRange(hsv, lower_skin, upper_skin)
+        # Create mask for skin color (simple approximation, lihat SKIN_HSV_*)
+        skin_mask = cv2.inRange(hsv, SKIN_HSV_LOWER, SKIN_HSV_UPPER)
         
         # Find contours
         contours, _ = cv2.findContours(skin_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -163,14 +177,14 @@ class VisionSystem:
 # Test function
 def test_vision_module():
     """Test vision module"""
-    from config import Config
+    from config import get_config
     
     print("Testing Vision Module...")
     print("Camera preview will open for 10 seconds")
     print("Press 'q' to quit early, or move in front of camera to test motion detection")
     
     try:
-        vision = VisionSystem(Config)
+        vision = VisionSystem(get_config())
         vision.start_capture()
         
         start_time = time.time()